@@ -3,21 +3,38 @@ Soil pH Linear Regression Analysis - Module Package
 Analysis modules for processing and modeling soil pH data.
 """
 
-from .data_loading import load_data, validate_dataset, get_data_summary
-from .data_cleaning import handle_missing_values, detect_outliers, prepare_regression_data, get_cleaning_report
+from .data_loading import (
+    load_data, iter_data_chunks, load_many, validate_dataset, validate_rows,
+    get_data_summary, append_readings
+)
+from .streaming import (
+    SummaryAccumulator, SiteAggregates, QuantileSketch, MomentAccumulator,
+    BreuschPaganAccumulator, DurbinWatsonAccumulator
+)
+from .data_cleaning import (
+    handle_missing_values, impute_missing, clean_chunks, detect_outliers,
+    detect_outliers_batch, iqr_bounds, CategoricalEncoder, FertilizerProductEncoder,
+    prepare_regression_data, get_cleaning_report
+)
 from .assumptions import (
     test_normality, calculate_vif, test_multicollinearity,
-    test_homoscedasticity, test_independence, generate_assumptions_report
+    test_homoscedasticity, test_independence, run_assumption_battery,
+    test_normality_monte_carlo, test_homoscedasticity_permutation,
+    test_independence_permutation, generate_assumptions_report
 )
 from .regression_model import (
     fit_multiple_regression, extract_regression_summary, extract_coefficients_table,
-    create_regression_table, get_residuals, generate_model_report, make_prediction
+    create_regression_table, get_residuals, generate_model_report, make_prediction,
+    fit_chunked_regression, fit_grouped_regressions, RecursiveOLS, BatchPredictor
 )
+from .design_cache import DesignCache
+from .model_search import search_subsets
 from .reporting import (
     create_descriptive_stats_table, create_correlation_table, create_regression_summary_table,
     create_model_fit_table, create_interpretation_text, export_tables_to_file,
     create_results_summary
 )
+from .pipeline import run_pipeline, track_memory
 from .visualizations import (
     plot_residual_diagnostics, plot_correlation_heatmap, plot_variable_distributions,
     plot_predictor_effects, plot_model_comparison, save_figure
@@ -25,24 +42,38 @@ from .visualizations import (
 
 __all__ = [
     # Data loading
-    'load_data', 'validate_dataset', 'get_data_summary',
+    'load_data', 'iter_data_chunks', 'load_many', 'validate_dataset', 'validate_rows',
+    'get_data_summary', 'append_readings',
+    
+    # Streaming statistics
+    'SummaryAccumulator', 'SiteAggregates', 'QuantileSketch', 'MomentAccumulator',
+    'BreuschPaganAccumulator', 'DurbinWatsonAccumulator',
     
     # Data cleaning
-    'handle_missing_values', 'detect_outliers', 'prepare_regression_data', 'get_cleaning_report',
+    'handle_missing_values', 'impute_missing', 'clean_chunks', 'detect_outliers',
+    'detect_outliers_batch', 'iqr_bounds', 'CategoricalEncoder', 'FertilizerProductEncoder',
+    'prepare_regression_data', 'get_cleaning_report',
     
     # Assumptions testing
     'test_normality', 'calculate_vif', 'test_multicollinearity',
-    'test_homoscedasticity', 'test_independence', 'generate_assumptions_report',
+    'test_homoscedasticity', 'test_independence', 'run_assumption_battery',
+    'test_normality_monte_carlo', 'test_homoscedasticity_permutation',
+    'test_independence_permutation', 'generate_assumptions_report',
     
     # Regression modeling
     'fit_multiple_regression', 'extract_regression_summary', 'extract_coefficients_table',
     'create_regression_table', 'get_residuals', 'generate_model_report', 'make_prediction',
+    'fit_chunked_regression', 'fit_grouped_regressions', 'RecursiveOLS', 'BatchPredictor',
+    'DesignCache', 'search_subsets',
     
     # Reporting
     'create_descriptive_stats_table', 'create_correlation_table', 'create_regression_summary_table',
     'create_model_fit_table', 'create_interpretation_text', 'export_tables_to_file',
     'create_results_summary',
     
+    # Pipeline
+    'run_pipeline', 'track_memory',
+    
     # Visualizations
     'plot_residual_diagnostics', 'plot_correlation_heatmap', 'plot_variable_distributions',
     'plot_predictor_effects', 'plot_model_comparison', 'save_figure'
@@ -6,42 +6,82 @@ Tests regression assumptions: normality, linearity, homoscedasticity, multicolli
 import pandas as pd
 import numpy as np
 from scipy import stats
-from statsmodels.stats.outliers_influence import variance_inflation_factor
 
+from .streaming import (
+    MomentAccumulator, QuantileSketch, BreuschPaganAccumulator, DurbinWatsonAccumulator
+)
 
-def test_normality(data, test_type='shapiro'):
+
+# Above this size Shapiro-Wilk p-values are unreliable and 'auto' switches
+# to the moment-based D'Agostino-Pearson test
+SHAPIRO_MAX_N = 5000
+
+
+def test_normality(data, test_type='shapiro', max_n=SHAPIRO_MAX_N, seed=None):
     """
     Test normality of residuals or dependent variable.
     
     Parameters
     ----------
-    data : array-like
-        Data to test (residuals or variable)
+    data : array-like, iterable of arrays or MomentAccumulator
+        Data to test (residuals or variable). The moment-based tests
+        ('dagostino', 'jarque_bera', and 'auto' for large n) also accept
+        an iterator or list of 1-D chunks, or a pre-built MomentAccumulator.
+        Missing values are dropped by these tests and excluded from 'n'
     test_type : str
-        Test method: 'shapiro', 'anderson', 'ks'
+        Test method: 'shapiro', 'anderson', 'ks', 'dagostino',
+        'jarque_bera', 'shapiro_subsample', or 'auto' (Shapiro-Wilk up to
+        max_n observations, D'Agostino-Pearson above)
+    max_n : int
+        Size threshold for 'auto' and subsample size for 'shapiro_subsample'
+    seed : int, optional
+        Seed for the 'shapiro_subsample' draw
     
     Returns
     -------
     dict
         Test results with interpretation
     """
+    if isinstance(data, MomentAccumulator) or _is_chunk_stream(data):
+        if test_type not in ('dagostino', 'jarque_bera', 'auto'):
+            raise ValueError(f"test_type '{test_type}' needs the data in memory")
+        moments = data if isinstance(data, MomentAccumulator) else _moments_of_chunks(data)
+        test_type = 'jarque_bera' if test_type == 'jarque_bera' else 'dagostino'
+        data = None
+    else:
+        data = np.asarray(data, dtype=np.float64)
+        if test_type == 'auto':
+            test_type = 'shapiro' if len(data) <= max_n else 'dagostino'
+        if test_type in ('dagostino', 'jarque_bera'):
+            moments = MomentAccumulator().update(data)
+    
     if test_type == 'shapiro':
         stat, p_value = stats.shapiro(data)
         test_name = 'Shapiro-Wilk Test'
+    elif test_type == 'shapiro_subsample':
+        stat, p_value = stats.shapiro(_stratified_subsample(data, max_n, seed))
+        test_name = f'Shapiro-Wilk Test (stratified subsample, n={min(len(data), max_n)})'
     elif test_type == 'anderson':
         result = stats.anderson(data)
         stat = result.statistic
-        p_value = result.critical_values[2]  # 5% level
+        p_value = _anderson_pvalue(stat, len(data))
         test_name = 'Anderson-Darling Test'
     elif test_type == 'ks':
         # Kolmogorov-Smirnov test
         stat, p_value = stats.kstest(data, 'norm', args=(np.mean(data), np.std(data)))
         test_name = 'Kolmogorov-Smirnov Test'
+    elif test_type == 'dagostino':
+        stat, p_value = _dagostino_pearson(moments)
+        test_name = "D'Agostino-Pearson Test"
+    elif test_type == 'jarque_bera':
+        stat, p_value = _jarque_bera(moments)
+        test_name = 'Jarque-Bera Test'
     else:
         raise ValueError(f"Unknown test_type: {test_type}")
     
     return {
         'test_name': test_name,
+        'n': moments.n if test_type in ('dagostino', 'jarque_bera') else len(data),
         'statistic': stat,
         'p_value': p_value,
         'normal_at_05': p_value > 0.05,
@@ -49,27 +89,181 @@ def test_normality(data, test_type='shapiro'):
     }
 
 
-def calculate_vif(X_df):
+def _is_chunk_stream(data):
+    """True for iterators of chunks and for lists or tuples of arrays/Series."""
+    if hasattr(data, '__next__'):
+        return True
+    return (isinstance(data, (list, tuple)) and len(data) > 0
+            and all(isinstance(chunk, (np.ndarray, pd.Series)) and chunk.ndim == 1 for chunk in data))
+
+
+def _moments_of_chunks(chunks):
+    moments = MomentAccumulator()
+    for chunk in chunks:
+        moments.update(chunk)
+    return moments
+
+
+def _dagostino_pearson(moments):
+    """D'Agostino-Pearson K² from streamed moments (as scipy.stats.normaltest)."""
+    n = moments.n
+    if n < 20:
+        raise ValueError(f"D'Agostino-Pearson test needs at least 20 observations, got {n}")
+    
+    # Skewness test
+    y = moments.skewness * np.sqrt((n + 1) * (n + 3) / (6.0 * (n - 2)))
+    beta2 = 3.0 * (n ** 2 + 27 * n - 70) * (n + 1) * (n + 3) / ((n - 2.0) * (n + 5) * (n + 7) * (n + 9))
+    w2 = -1 + np.sqrt(2 * (beta2 - 1))
+    delta = 1 / np.sqrt(0.5 * np.log(w2))
+    alpha = np.sqrt(2.0 / (w2 - 1))
+    y = 1.0 if y == 0 else y
+    z_skew = delta * np.log(y / alpha + np.sqrt((y / alpha) ** 2 + 1))
+    
+    # Kurtosis test
+    expected = 3.0 * (n - 1) / (n + 1)
+    var_b2 = 24.0 * n * (n - 2) * (n - 3) / ((n + 1) ** 2.0 * (n + 3) * (n + 5))
+    x = (moments.kurtosis - expected) / np.sqrt(var_b2)
+    sqrt_beta1 = (6.0 * (n * n - 5 * n + 2) / ((n + 7) * (n + 9))
+                  * np.sqrt((6.0 * (n + 3) * (n + 5)) / (n * (n - 2) * (n - 3))))
+    a = 6.0 + 8.0 / sqrt_beta1 * (2.0 / sqrt_beta1 + np.sqrt(1 + 4.0 / sqrt_beta1 ** 2))
+    term1 = 1 - 2 / (9.0 * a)
+    denom = 1 + x * np.sqrt(2 / (a - 4.0))
+    term2 = np.sign(denom) * np.cbrt((1 - 2.0 / a) / abs(denom)) if denom != 0 else np.nan
+    z_kurt = (term1 - term2) / np.sqrt(2 / (9.0 * a))
+    
+    k2 = z_skew ** 2 + z_kurt ** 2
+    return k2, stats.chi2.sf(k2, 2)
+
+
+def _jarque_bera(moments):
+    """Jarque-Bera statistic from streamed moments (as scipy.stats.jarque_bera)."""
+    jb = moments.n / 6.0 * (moments.skewness ** 2 + (moments.kurtosis - 3) ** 2 / 4.0)
+    return jb, stats.chi2.sf(jb, 2)
+
+
+def _stratified_subsample(data, size, seed=None):
+    """Equal-sized random draws from contiguous strata of the data order."""
+    n = len(data)
+    if n <= size:
+        return data
+    rng = np.random.default_rng(seed)
+    edges = np.linspace(0, n, size + 1).astype(np.int64)
+    # One draw per stratum keeps coverage of the whole sequence
+    picks = edges[:-1] + (rng.random(size) * (edges[1:] - edges[:-1])).astype(np.int64)
+    return data[picks]
+
+
+def _anderson_pvalue(statistic, n):
+    """
+    Approximate p-value of the Anderson-Darling normality statistic with
+    estimated mean and variance (D'Agostino & Stephens, 1986).
+    """
+    a2 = statistic * (1 + 0.75 / n + 2.25 / n ** 2)
+    if a2 >= 0.6:
+        return np.exp(1.2937 - 5.709 * a2 + 0.0186 * a2 ** 2)
+    if a2 >= 0.34:
+        return np.exp(0.9177 - 4.279 * a2 - 1.38 * a2 ** 2)
+    if a2 >= 0.2:
+        return 1 - np.exp(-8.318 + 42.796 * a2 - 59.938 * a2 ** 2)
+    return 1 - np.exp(-13.436 + 101.14 * a2 - 223.73 * a2 ** 2)
+
+
+def calculate_vif(X_df, centered=True, feature_names=None):
     """
     Calculate Variance Inflation Factor (VIF) for multicollinearity detection.
     
+    All VIFs come from the diagonal of one inverted correlation (or scaled
+    Gram) matrix instead of one auxiliary regression per column. The matrix
+    is accumulated from X'X, so sparse designs are never densified and
+    chunked data needs a single pass.
+    
     Parameters
     ----------
-    X_df : pd.DataFrame
-        Feature matrix
+    X_df : pd.DataFrame, np.ndarray, scipy.sparse matrix or iterable of pd.DataFrame
+        Feature matrix, or chunks of it
+    centered : bool
+        True for the usual centered VIF (constant columns get 1, as in
+        statsmodels); False for the uncentered VIF of the design as given
+    feature_names : list, optional
+        Column names for array or sparse input
     
     Returns
     -------
     pd.DataFrame
         VIF values for each variable
     """
+    gram, sums, n, names = _accumulate_gram(X_df, feature_names)
+    
+    diag = np.diag(gram).copy()
+    vif = np.full(len(diag), np.nan)
+    if centered:
+        scatter = gram - np.outer(sums, sums) / n
+        variable = np.sqrt(np.clip(np.diag(scatter), 0, None) / n) > 1e-10
+        vif[~variable & (diag > 0)] = 1.0
+        matrix = scatter
+    else:
+        variable = diag > 0
+        matrix = gram
+    
+    idx = np.flatnonzero(variable)
+    scale = np.sqrt(np.diag(matrix)[idx])
+    corr = matrix[np.ix_(idx, idx)] / np.outer(scale, scale)
+    vif[idx] = _inverse_diagonal(corr)
+    
     vif_data = pd.DataFrame()
-    vif_data['Variable'] = X_df.columns
-    vif_data['VIF'] = [variance_inflation_factor(X_df.values, i) for i in range(X_df.shape[1])]
+    vif_data['Variable'] = names
+    vif_data['VIF'] = vif
     
     return vif_data.sort_values('VIF', ascending=False)
 
 
+def _accumulate_gram(X, feature_names=None):
+    """X'X, column sums, row count and column names from dense, sparse or chunked X."""
+    from scipy import sparse
+    
+    if isinstance(X, pd.DataFrame) or sparse.issparse(X) or isinstance(X, np.ndarray):
+        chunks = [X]
+    else:
+        chunks = X
+    
+    gram, sums, n, names = None, None, 0, feature_names
+    for chunk in chunks:
+        if isinstance(chunk, pd.DataFrame):
+            names = names if names is not None else chunk.columns.tolist()
+            chunk = chunk.to_numpy(dtype=np.float64)
+        if sparse.issparse(chunk):
+            chunk = sparse.csr_matrix(chunk, dtype=np.float64)
+            chunk_gram = (chunk.T @ chunk).toarray()
+            chunk_sums = np.asarray(chunk.sum(axis=0)).ravel()
+        else:
+            chunk = np.asarray(chunk, dtype=np.float64)
+            chunk_gram = chunk.T @ chunk
+            chunk_sums = chunk.sum(axis=0)
+        gram = chunk_gram if gram is None else gram + chunk_gram
+        sums = chunk_sums if sums is None else sums + chunk_sums
+        n += chunk.shape[0]
+    
+    if gram is None:
+        raise ValueError("No data to calculate VIF from")
+    if names is None:
+        names = [f"x{i}" for i in range(gram.shape[0])]
+    
+    return gram, sums, n, list(names)
+
+
+def _inverse_diagonal(matrix, tol=1e-10):
+    """Diagonal of the inverse of a symmetric PSD matrix; inf where it is singular."""
+    if matrix.size == 0:
+        return np.empty(0)
+    eigvals, eigvecs = np.linalg.eigh(matrix)
+    keep = eigvals > tol * max(eigvals.max(), 1.0)
+    diag = (eigvecs[:, keep] ** 2 / eigvals[keep]).sum(axis=1)
+    # Columns taking part in an exact linear dependence have unbounded VIF
+    collinear = (np.abs(eigvecs[:, ~keep]) > 1e-8).any(axis=1)
+    diag[collinear] = np.inf
+    return diag
+
+
 def test_multicollinearity(X_df, vif_threshold=5):
     """
     Test for multicollinearity and correlation issues.
@@ -98,25 +292,42 @@ def test_multicollinearity(X_df, vif_threshold=5):
     }
 
 
-def test_homoscedasticity(residuals, fitted_values):
+def test_homoscedasticity(residuals, fitted_values=None):
     """
     Test for homoscedasticity (Breusch-Pagan test).
     
     Parameters
     ----------
-    residuals : array-like
-        Model residuals
-    fitted_values : array-like
-        Fitted values
+    residuals : array-like, iterable of arrays or BreuschPaganAccumulator
+        Model residuals. An iterator or list of residual chunks is paired
+        with fitted-value chunks and reduced to the auxiliary
+        regression's cross-products, so out-of-core fits never need all
+        residuals in memory
+    fitted_values : array-like or iterable of arrays
+        Fitted values, or a design matrix that already includes a constant
+        (not needed when residuals is an accumulator)
     
     Returns
     -------
     dict
         Homoscedasticity test results
     """
-    from statsmodels.stats.diagnostic import het_breuschpagan
-    
-    bp_stat, bp_pvalue, _, _ = het_breuschpagan(residuals, fitted_values)
+    if isinstance(residuals, BreuschPaganAccumulator):
+        bp_stat, bp_pvalue = residuals.result()
+    elif _is_chunk_stream(residuals):
+        accumulator = BreuschPaganAccumulator()
+        for resid_chunk, fitted_chunk in zip(residuals, fitted_values, strict=True):
+            accumulator.update(resid_chunk, fitted_chunk)
+        bp_stat, bp_pvalue = accumulator.result()
+    else:
+        from statsmodels.stats.diagnostic import het_breuschpagan
+        
+        exog_het = np.asarray(fitted_values, dtype=np.float64)
+        if exog_het.ndim == 1:
+            # Breusch-Pagan needs a constant alongside the fitted values
+            exog_het = np.column_stack([np.ones_like(exog_het), exog_het])
+        
+        bp_stat, bp_pvalue, _, _ = het_breuschpagan(residuals, exog_het)
     
     return {
         'test_name': 'Breusch-Pagan Test',
@@ -133,17 +344,27 @@ def test_independence(residuals):
     
     Parameters
     ----------
-    residuals : array-like
-        Model residuals
+    residuals : array-like, iterable of arrays or DurbinWatsonAccumulator
+        Model residuals. An iterator or list of residual chunks (in
+        observation order) is reduced chunk by chunk, including the
+        differences across chunk boundaries
     
     Returns
     -------
     dict
         Independence test results
     """
-    from statsmodels.stats.stattools import durbin_watson
-    
-    dw_stat = durbin_watson(residuals)
+    if isinstance(residuals, DurbinWatsonAccumulator):
+        dw_stat = residuals.result()
+    elif _is_chunk_stream(residuals):
+        accumulator = DurbinWatsonAccumulator()
+        for chunk in residuals:
+            accumulator.update(chunk)
+        dw_stat = accumulator.result()
+    else:
+        from statsmodels.stats.stattools import durbin_watson
+        
+        dw_stat = durbin_watson(residuals)
     
     # DW = 2 means no autocorrelation; range is 0-4
     # DW < 2: positive correlation; DW > 2: negative correlation
@@ -157,24 +378,418 @@ def test_independence(residuals):
     }
 
 
-def get_qq_plot_data(residuals):
+def run_assumption_battery(model, normality_test='shapiro', vif_threshold=5, n_workers=4):
     """
-    Get data for Q-Q plot (quantile-quantile plot).
+    Run all assumption tests on a fitted model concurrently.
+    
+    Residuals, fitted values and the design matrix are extracted from the
+    model once and shared by the normality, multicollinearity,
+    homoscedasticity and independence tests, which run in a thread pool.
+    
+    Parameters
+    ----------
+    model : RegressionResults
+        Fitted statsmodels regression
+    normality_test : str
+        test_type passed to test_normality
+    vif_threshold : float
+        VIF threshold passed to test_multicollinearity
+    n_workers : int
+        Worker threads (1 runs the tests sequentially)
+    
+    Returns
+    -------
+    dict
+        Test results keyed as generate_assumptions_report expects
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    residuals = np.asarray(model.resid, dtype=np.float64)
+    fitted = np.asarray(model.fittedvalues, dtype=np.float64)
+    exog = np.asarray(model.model.exog, dtype=np.float64)
+    names = list(model.model.exog_names)
+    
+    # VIF is computed on the predictors only
+    const = [i for i, name in enumerate(names) if name in ('Intercept', 'const')]
+    predictors = [i for i in range(len(names)) if i not in const]
+    X_df = pd.DataFrame(exog[:, predictors], columns=[names[i] for i in predictors])
+    
+    tests = {
+        'normality': lambda: test_normality(residuals, test_type=normality_test),
+        'multicollinearity': lambda: test_multicollinearity(X_df, vif_threshold=vif_threshold),
+        'homoscedasticity': lambda: test_homoscedasticity(residuals, fitted),
+        'independence': lambda: test_independence(residuals)
+    }
+    
+    if n_workers == 1:
+        return {name: run() for name, run in tests.items()}
+    
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        futures = {name: pool.submit(run) for name, run in tests.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+# Resampling tests draw this many permutations/samples per RNG stream; the
+# split is fixed so results do not depend on the number of workers
+RESAMPLE_BATCH_SIZE = 1000
+
+
+def _resample_null(batch_statistic, n_resamples, seed=None, n_workers=4,
+                   batch_size=RESAMPLE_BATCH_SIZE):
+    """
+    Null distribution of a statistic from batched resamples.
+    
+    The resamples are split into fixed-size batches, each drawn from its own
+    child of np.random.SeedSequence(seed), and evaluated in a thread pool.
+    batch_statistic(rng, size) must return `size` statistics as an array.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    sizes = [batch_size] * (n_resamples // batch_size)
+    if n_resamples % batch_size:
+        sizes.append(n_resamples % batch_size)
+    streams = [np.random.default_rng(child)
+               for child in np.random.SeedSequence(seed).spawn(len(sizes))]
+    
+    if n_workers == 1 or len(sizes) == 1:
+        return np.concatenate([batch_statistic(rng, size) for rng, size in zip(streams, sizes)])
+    
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        return np.concatenate(list(pool.map(batch_statistic, streams, sizes)))
+
+
+def _resample_pvalue(observed, null, alternative='greater'):
+    """Monte Carlo p-value that counts the observed statistic as one resample."""
+    upper = (1 + np.count_nonzero(null >= observed)) / (1 + len(null))
+    if alternative == 'greater':
+        return upper
+    lower = (1 + np.count_nonzero(null <= observed)) / (1 + len(null))
+    return min(1.0, 2 * min(upper, lower))
+
+
+def _normality_statistics(samples, test_type):
+    """Batched location-scale invariant normality statistics, one per row."""
+    n = samples.shape[1]
+    if test_type == 'jarque_bera':
+        dev = samples - samples.mean(axis=1, keepdims=True)
+        m2 = (dev ** 2).mean(axis=1)
+        skew = (dev ** 3).mean(axis=1) / m2 ** 1.5
+        kurt = (dev ** 4).mean(axis=1) / m2 ** 2
+        return n / 6.0 * (skew ** 2 + (kurt - 3) ** 2 / 4.0)
+    
+    z = np.sort(samples, axis=1)
+    z = (z - z.mean(axis=1, keepdims=True)) / z.std(axis=1, ddof=1, keepdims=True)
+    if test_type == 'anderson':
+        from scipy.special import log_ndtr
+        
+        weights = 2 * np.arange(1, n + 1) - 1
+        terms = log_ndtr(z) + log_ndtr(-z[:, ::-1])
+        return -n - (weights * terms).sum(axis=1) / n
+    if test_type == 'ks':
+        cdf = stats.norm.cdf(z)
+        ranks = np.arange(1, n + 1) / n
+        return np.maximum((ranks - cdf).max(axis=1), (cdf - ranks + 1 / n).max(axis=1))
+    raise ValueError(f"Unknown test_type: {test_type}")
+
+
+def test_normality_monte_carlo(data, test_type='anderson', n_resamples=9999, seed=None, n_workers=4):
+    """
+    Normality test with a Monte Carlo (parametric bootstrap) p-value.
+    
+    The statistics are invariant to location and scale, so their null
+    distribution for this sample size is simulated exactly from standard
+    normal samples, drawn as (batch, n) arrays. Suited to small subsets
+    where the asymptotic p-values of test_normality are unreliable.
+    
+    Parameters
+    ----------
+    data : array-like
+        Data to test (residuals or variable)
+    test_type : str
+        Statistic: 'anderson' (Anderson-Darling), 'ks' (Lilliefors-style
+        Kolmogorov-Smirnov with estimated parameters) or 'jarque_bera'
+    n_resamples : int
+        Number of simulated samples
+    seed : int, optional
+        Seed for reproducible resampling
+    n_workers : int
+        Worker threads evaluating resample batches
+    
+    Returns
+    -------
+    dict
+        Test results with interpretation
+    """
+    data = np.asarray(data, dtype=np.float64)
+    data = data[~np.isnan(data)]
+    observed = _normality_statistics(data[np.newaxis, :], test_type)[0]
+    
+    def batch_statistic(rng, size):
+        return _normality_statistics(rng.standard_normal((size, len(data))), test_type)
+    
+    null = _resample_null(batch_statistic, n_resamples, seed, n_workers)
+    p_value = _resample_pvalue(observed, null)
+    names = {'anderson': 'Anderson-Darling', 'ks': 'Kolmogorov-Smirnov', 'jarque_bera': 'Jarque-Bera'}
+    
+    return {
+        'test_name': f'{names[test_type]} Test (Monte Carlo, {n_resamples} samples)',
+        'n': len(data),
+        'statistic': observed,
+        'p_value': p_value,
+        'normal_at_05': p_value > 0.05,
+        'interpretation': 'Approximately normally distributed' if p_value > 0.05 else 'May not be normally distributed'
+    }
+
+
+def test_homoscedasticity_permutation(residuals, fitted_values, n_resamples=9999, seed=None, n_workers=4):
+    """
+    Breusch-Pagan test with a permutation p-value.
+    
+    Under homoscedasticity the squared residuals are exchangeable with
+    respect to the auxiliary design, so permuting them gives the null
+    distribution of Koenker's n·R² statistic. Permutations keep Σu and Σu²
+    fixed, so each batch reduces to one projection onto an orthonormal
+    basis of the centered design.
     
     Parameters
     ----------
     residuals : array-like
         Model residuals
+    fitted_values : array-like
+        Fitted values, or a design matrix that already includes a constant
+    n_resamples : int
+        Number of permutations
+    seed : int, optional
+        Seed for reproducible resampling
+    n_workers : int
+        Worker threads evaluating permutation batches
+    
+    Returns
+    -------
+    dict
+        Homoscedasticity test results
+    """
+    u = np.asarray(residuals, dtype=np.float64) ** 2
+    Z = np.asarray(fitted_values, dtype=np.float64)
+    if Z.ndim == 1:
+        Z = Z[:, np.newaxis]
+    
+    # Orthonormal basis of the non-constant columns after centering
+    Zc = Z - Z.mean(axis=0)
+    Zc = Zc[:, Zc.std(axis=0) > 0]
+    Q, R = np.linalg.qr(Zc)
+    Q = Q[:, np.abs(np.diag(R)) > 1e-10 * np.abs(R).max()]
+    
+    uc = u - u.mean()
+    n, tss = len(u), uc @ uc
+    observed = n * np.sum((Q.T @ uc) ** 2) / tss
+    
+    def batch_statistic(rng, size):
+        permuted = rng.permuted(np.broadcast_to(uc, (size, n)), axis=1)
+        return n * np.sum((permuted @ Q) ** 2, axis=1) / tss
+    
+    null = _resample_null(batch_statistic, n_resamples, seed, n_workers)
+    p_value = _resample_pvalue(observed, null)
+    
+    return {
+        'test_name': f'Breusch-Pagan Test (permutation, {n_resamples} resamples)',
+        'statistic': observed,
+        'p_value': p_value,
+        'homoscedastic_at_05': p_value > 0.05,
+        'interpretation': 'Homoscedasticity assumption appears satisfied' if p_value > 0.05 else 'Heteroscedasticity detected'
+    }
+
+
+def test_independence_permutation(residuals, n_resamples=9999, seed=None, n_workers=4):
+    """
+    Durbin-Watson test with a two-sided permutation p-value.
+    
+    Shuffling the residual order destroys any serial dependence while
+    keeping Σe² fixed, so only the lag-1 differences are recomputed for
+    each batch of permutations.
+    
+    Parameters
+    ----------
+    residuals : array-like
+        Model residuals in observation order
+    n_resamples : int
+        Number of permutations
+    seed : int, optional
+        Seed for reproducible resampling
+    n_workers : int
+        Worker threads evaluating permutation batches
+    
+    Returns
+    -------
+    dict
+        Independence test results
+    """
+    resid = np.asarray(residuals, dtype=np.float64)
+    sum_e2 = resid @ resid
+    observed = np.sum(np.diff(resid) ** 2) / sum_e2
+    
+    def batch_statistic(rng, size):
+        permuted = rng.permuted(np.broadcast_to(resid, (size, len(resid))), axis=1)
+        return np.sum(np.diff(permuted, axis=1) ** 2, axis=1) / sum_e2
+    
+    null = _resample_null(batch_statistic, n_resamples, seed, n_workers)
+    p_value = _resample_pvalue(observed, null, alternative='two-sided')
+    
+    return {
+        'test_name': f'Durbin-Watson Test (permutation, {n_resamples} resamples)',
+        'statistic': observed,
+        'p_value': p_value,
+        'independent_at_05': p_value > 0.05,
+        'range': (0, 4),
+        'neutral_value': 2,
+        'interpretation': f'DW={observed:.3f}, permutation p={p_value:.4f}. ' + (
+            'No evidence of autocorrelation' if p_value > 0.05 else 'Residuals appear autocorrelated')
+    }
+
+
+def get_qq_plot_data(residuals, n_points=None, tail_points=50, sketch_error=0.001,
+                     positions='uniform', fit=False, seed=None):
+    """
+    Get data for Q-Q plot (quantile-quantile plot).
+    
+    Order statistic i of n is plotted against the normal quantile at
+    0.01 + 0.98·i/(n-1) ('uniform') or at Filliben's order statistic
+    medians as in scipy.stats.probplot ('filliben'). With n_points set,
+    only that many order statistics are returned: the tail_points smallest
+    and largest exactly, and the interior at evenly spaced ranks. Arrays
+    give exact order statistics; for a stream of chunks the interior comes
+    from a QuantileSketch while the tails are kept exact with np.partition
+    on each chunk.
+    
+    Parameters
+    ----------
+    residuals : array-like or iterable of arrays
+        Model residuals, or an iterator or list of residual chunks
+    n_points : int, optional
+        Number of points to return (None returns all n, fully sorted;
+        required for chunk iterators)
+    tail_points : int
+        Exact order statistics kept at each end
+    sketch_error : float
+        Rank error of the sketch used for chunk iterators
+    positions : str
+        Plotting positions: 'uniform' or 'filliben'
+    fit : bool
+        Also return probplot's least-squares reference line, fitted on the
+        returned points weighted by the number of ranks each represents
+        (exact when all n points are returned)
+    seed : int, optional
+        Seed for the sketch used for chunk iterators
     
     Returns
     -------
     tuple
-        (theoretical_quantiles, sample_quantiles)
+        (theoretical_quantiles, sample_quantiles), followed by
+        (slope, intercept, r) when fit is True
     """
-    theoretical_quantiles = stats.norm.ppf(np.linspace(0.01, 0.99, len(residuals)))
-    sample_quantiles = np.sort(residuals)
+    if positions not in ('uniform', 'filliben'):
+        raise ValueError(f"Unknown positions: {positions}. Use 'uniform' or 'filliben'")
+    
+    if _is_chunk_stream(residuals):
+        if n_points is None:
+            raise ValueError("n_points is required when residuals are streamed in chunks")
+        ranks, n, sample_quantiles = _streamed_qq_points(residuals, n_points, tail_points,
+                                                         sketch_error, seed)
+    else:
+        residuals = np.asarray(residuals, dtype=np.float64)
+        n = len(residuals)
+        # NumPy's vectorized sort beats a many-kth np.partition here; the
+        # saving is in evaluating the normal quantiles and drawing only n_points
+        sample_quantiles = np.sort(residuals)
+        if n_points is not None and n > n_points:
+            ranks = _qq_ranks(n, n_points, tail_points)
+            sample_quantiles = sample_quantiles[ranks]
+        else:
+            ranks = np.arange(n)
+    
+    theoretical_quantiles = _qq_theoretical(ranks, n, positions)
+    if not fit:
+        return theoretical_quantiles, sample_quantiles
+    
+    # Each point stands for the ranks between its neighbours' midpoints;
+    # with all n points every weight is 1 and this is probplot's fit
+    edges = np.concatenate([[-0.5], (ranks[1:] + ranks[:-1]) / 2, [n - 0.5]])
+    line = _qq_fit(theoretical_quantiles, sample_quantiles, np.diff(edges))
+    return theoretical_quantiles, sample_quantiles, line
+
+
+def _qq_ranks(n, n_points, tail_points):
+    """Exact tail ranks plus evenly spaced interior ranks, sorted and unique."""
+    tail_points = min(tail_points, n_points // 2)
+    interior = np.linspace(tail_points, n - tail_points - 1, max(n_points - 2 * tail_points, 0))
+    ranks = np.concatenate([np.arange(tail_points), np.round(interior).astype(np.int64),
+                            np.arange(n - tail_points, n)])
+    return np.unique(ranks)
+
+
+def _qq_theoretical(ranks, n, positions='uniform'):
+    """Normal quantiles at the plotting positions of 0-based ranks of n."""
+    if positions == 'filliben':
+        return stats.norm.ppf(_filliben(ranks, n))
+    return stats.norm.ppf(0.01 + 0.98 * ranks / max(n - 1, 1))
+
+
+def _filliben(ranks, n):
+    """Filliben's uniform order statistic medians (as scipy.stats.probplot)."""
+    last = 0.5 ** (1.0 / n)
+    medians = (ranks + 1 - 0.3175) / (n + 0.365)
+    medians = np.where(ranks == 0, 1 - last, medians)
+    return np.where(ranks == n - 1, last, medians)
+
+
+def _qq_fit(x, y, weights=None):
+    """Least-squares line (slope, intercept, r) of y on x, optionally weighted."""
+    weights = np.ones_like(x) if weights is None else weights
+    x_mean = np.average(x, weights=weights)
+    y_mean = np.average(y, weights=weights)
+    sxx = np.sum(weights * (x - x_mean) ** 2)
+    syy = np.sum(weights * (y - y_mean) ** 2)
+    sxy = np.sum(weights * (x - x_mean) * (y - y_mean))
+    slope = sxy / sxx
+    return slope, y_mean - slope * x_mean, sxy / np.sqrt(sxx * syy)
+
+
+def _streamed_qq_points(chunks, n_points, tail_points, sketch_error, seed=None):
+    """
+    Q-Q order statistics from chunks: sketch for the interior, running exact tails.
+    
+    Returns (ranks, n, sample_quantiles).
+    """
+    sketch = QuantileSketch(error=sketch_error, exact_limit=max(10_000, n_points), seed=seed)
+    low = high = np.empty(0)
+    for chunk in chunks:
+        chunk = np.asarray(chunk, dtype=np.float64).ravel()
+        chunk = chunk[~np.isnan(chunk)]
+        sketch.update(chunk)
+        if tail_points == 0:
+            continue
+        # Keep only the tail_points smallest and largest values seen so far
+        low = np.concatenate([low, chunk])
+        if len(low) > tail_points:
+            low = np.partition(low, tail_points - 1)[:tail_points]
+        high = np.concatenate([high, chunk])
+        if len(high) > tail_points:
+            high = np.partition(high, len(high) - tail_points)[-tail_points:]
+    
+    n = sketch.n
+    if n <= n_points:
+        # Few enough values that the sketch still holds them exactly
+        ranks = np.arange(n)
+        return ranks, n, sketch.quantile(ranks / max(n - 1, 1))
+    
+    ranks = _qq_ranks(n, n_points, tail_points)
+    n_tail = min(tail_points, n_points // 2)
+    
+    sample_quantiles = sketch.quantile(ranks / (n - 1))
+    sample_quantiles[:n_tail] = np.sort(low)[:n_tail]
+    sample_quantiles[len(ranks) - n_tail:] = np.sort(high)[len(high) - n_tail:]
     
-    return theoretical_quantiles, sample_quantiles
+    return ranks, n, sample_quantiles
 
 
 def generate_assumptions_report(test_results):
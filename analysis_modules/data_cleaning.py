@@ -3,12 +3,27 @@ Data Cleaning Module
 Handles missing value imputation, outlier detection, and data preparation.
 """
 
+import re
 import pandas as pd
 import numpy as np
+from pathlib import Path
 from scipy import stats
 
+from .data_loading import iter_data_chunks
+from .streaming import QuantileSketch
 
-def handle_missing_values(df, strategy='documented'):
+
+# Per-column strategies used by handle_missing_values(strategy='documented')
+DOCUMENTED_STRATEGIES = {
+    'pH_reading': 'drop',
+    'fertilizer_kg_ha': 'group_mean',
+    'years_planted': 'mean'
+}
+
+IMPUTATION_GROUP_KEYS = ['Barangay', 'Crop']
+
+
+def handle_missing_values(df, strategy='documented', copy=True):
     """
     Handle missing values in dataset with documented strategy.
     
@@ -16,15 +31,69 @@ def handle_missing_values(df, strategy='documented'):
     ----------
     df : pd.DataFrame
         Input dataset
-    strategy : str
-        Strategy: 'remove', 'mean_impute', 'group_mean', 'documented'
+    strategy : str or dict
+        Strategy: 'remove', 'mean_impute', 'group_mean', 'documented', or a
+        per-column mapping accepted by impute_missing
+    copy : bool
+        Deep-copy the input first; False shares unchanged columns with df
+    
+    Returns
+    -------
+    pd.DataFrame, dict
+        Cleaned dataset and cleaning documentation
+    """
+    return impute_missing(df, _resolve_strategy(strategy), copy=copy)
+
+
+def _resolve_strategy(strategy):
+    """Per-column strategy mapping for a preset name or mapping."""
+    if isinstance(strategy, dict):
+        return strategy
+    if strategy == 'documented':
+        return DOCUMENTED_STRATEGIES
+    presets = {'remove': 'drop', 'mean_impute': 'mean', 'group_mean': 'group_mean'}
+    if strategy not in presets:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    return {'pH_reading': 'drop',
+            'fertilizer_kg_ha': presets[strategy],
+            'years_planted': presets[strategy]}
+
+
+def impute_missing(df, strategies, group_keys=None, copy=True):
+    """
+    Apply declarative per-column missing-value strategies.
+    
+    Rows are dropped first; all group statistics are then computed in one
+    vectorized aggregation per statistic and broadcast back by group code.
+    Group strategies fall back to the overall statistic for rows whose
+    group has no observed values.
+    
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Input dataset
+    strategies : dict
+        Mapping of column to 'drop', 'mean', 'group_mean' or 'group_median';
+        columns absent from df are ignored
+    group_keys : list, optional
+        Grouping columns for group strategies (default Barangay, Crop)
+    copy : bool
+        Deep-copy the input first. With False, only imputed columns are
+        replaced (never written in place), so df itself is left unchanged
+        while untouched columns are shared with it
     
     Returns
     -------
     pd.DataFrame, dict
         Cleaned dataset and cleaning documentation
     """
-    df_clean = df.copy()
+    group_keys = IMPUTATION_GROUP_KEYS if group_keys is None else list(group_keys)
+    valid = {'drop', 'mean', 'group_mean', 'group_median'}
+    unknown = {name for name in strategies.values() if name not in valid}
+    if unknown:
+        raise ValueError(f"Unknown imputation strategy: {', '.join(sorted(unknown))}")
+    
+    df_clean = df.copy(deep=copy)
     documentation = {
         'original_n': len(df),
         'missing_by_variable': {},
@@ -32,43 +101,230 @@ def handle_missing_values(df, strategy='documented'):
         'rows_removed': 0
     }
     
-    # For pH (dependent variable): Remove rows with missing pH
-    if 'pH_reading' in df_clean.columns:
+    strategies = {col: name for col, name in strategies.items() if col in df_clean.columns}
+    
+    drop_cols = [col for col, name in strategies.items() if name == 'drop']
+    for col in drop_cols:
         initial_n = len(df_clean)
-        df_clean = df_clean[df_clean['pH_reading'].notna()]
-        documentation['rows_removed'] = initial_n - len(df_clean)
-        documentation['missing_by_variable']['pH_reading'] = f"Removed {documentation['rows_removed']} rows"
-    
-    # For fertilizer_kg_ha: Impute with group means (by Barangay and Crop)
-    if 'fertilizer_kg_ha' in df_clean.columns:
-        missing_count = df_clean['fertilizer_kg_ha'].isnull().sum()
-        if missing_count > 0:
-            df_clean['fertilizer_kg_ha'] = df_clean.groupby(['Barangay', 'Crop'])['fertilizer_kg_ha'].transform(
-                lambda x: x.fillna(x.mean())
-            )
-            # Fill remaining with overall mean
-            df_clean['fertilizer_kg_ha'] = df_clean['fertilizer_kg_ha'].fillna(
-                df_clean['fertilizer_kg_ha'].mean()
-            )
-            documentation['imputation_strategy']['fertilizer_kg_ha'] = 'Group mean (Barangay×Crop), then overall mean'
-            documentation['missing_by_variable']['fertilizer_kg_ha'] = missing_count
-    
-    # For years_planted: Impute with mean
-    if 'years_planted' in df_clean.columns:
-        missing_count = df_clean['years_planted'].isnull().sum()
-        if missing_count > 0:
-            df_clean['years_planted'] = df_clean['years_planted'].fillna(
-                df_clean['years_planted'].mean()
+        df_clean = df_clean[df_clean[col].notna()]
+        removed = initial_n - len(df_clean)
+        documentation['rows_removed'] += removed
+        documentation['missing_by_variable'][col] = f"Removed {removed} rows"
+    
+    missing_counts = df_clean.isnull().sum()
+    fill_cols = [col for col, name in strategies.items()
+                 if name != 'drop' and missing_counts[col] > 0]
+    if not fill_cols:
+        documentation['final_n'] = len(df_clean)
+        return df_clean, documentation
+    
+    group_stat = {'group_mean': 'mean', 'group_median': 'median'}
+    group_cols = {stat: [col for col in fill_cols if group_stat.get(strategies[col]) == stat]
+                  for stat in ('mean', 'median')}
+    
+    fills = {}
+    if group_cols['mean'] or group_cols['median']:
+        grouped = df_clean.groupby(group_keys, observed=True, sort=False)
+        codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        for stat, cols in group_cols.items():
+            if not cols:
+                continue
+            table = grouped[cols].agg(stat).to_numpy(dtype=np.float64)
+            # Rows with a missing group key (code -1) get NaN and use the overall fallback
+            table = np.vstack([table, np.full((1, len(cols)), np.nan)])
+            broadcast = table[codes]
+            for i, col in enumerate(cols):
+                fills[col] = broadcast[:, i]
+    
+    keys_label = '×'.join(group_keys)
+    for col in fill_cols:
+        values = df_clean[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        stat = 'median' if strategies[col] == 'group_median' else 'mean'
+        overall = np.nanmedian(values) if stat == 'median' else np.nanmean(values)
+        fill = fills.get(col, np.full(len(values), np.nan))
+        fill = np.where(np.isnan(fill), overall, fill)
+        filled = np.where(np.isnan(values), fill, values)
+        dtype = df_clean[col].dtype
+        df_clean[col] = filled.astype(dtype) if dtype.kind == 'f' else filled
+        
+        if strategies[col] == 'mean':
+            documentation['imputation_strategy'][col] = 'Overall mean'
+        else:
+            documentation['imputation_strategy'][col] = (
+                f"Group {stat} ({keys_label}), then overall {stat}"
             )
-            documentation['imputation_strategy']['years_planted'] = 'Overall mean'
-            documentation['missing_by_variable']['years_planted'] = missing_count
+        documentation['missing_by_variable'][col] = missing_counts[col]
     
     documentation['final_n'] = len(df_clean)
     
     return df_clean, documentation
 
 
-def detect_outliers(df, column, method='iqr', threshold=1.5):
+def clean_chunks(source, strategy='documented', outlier_columns=None, method='iqr',
+                 threshold=1.5, group_keys=None, chunksize=50000, quantile_error=0.005):
+    """
+    Clean chunked data out of core in two passes.
+    
+    The first pass collects row counts, group sums/counts and outlier
+    statistics; the second pass (run lazily by the returned iterator)
+    drops rows, fills missing values and adds '<column>_outlier' flags.
+    Memory is bounded by the chunk size, the number of groups and the
+    quantile sketch size. Outlier bounds are computed from observed values
+    before imputation.
+    
+    Parameters
+    ----------
+    source : str or callable
+        Data file path, or a callable returning a fresh iterable of chunks
+        (the data is read twice)
+    strategy : str or dict
+        'remove', 'mean_impute', 'group_mean', 'documented' (as
+        handle_missing_values), or a per-column mapping of 'drop', 'mean'
+        or 'group_mean'
+    outlier_columns : list, optional
+        Columns to flag for outliers
+    method : str
+        Outlier method: 'iqr', 'zscore'
+    threshold : float
+        Threshold for outlier detection
+    group_keys : list, optional
+        Grouping columns for group strategies (default Barangay, Crop)
+    chunksize : int
+        Rows per chunk when source is a path
+    quantile_error : float
+        Rank error of the QuantileSketch used for IQR quantiles
+    
+    Returns
+    -------
+    iterator of pd.DataFrame, dict
+        Cleaned chunks and cleaning documentation (as handle_missing_values,
+        plus 'outlier_bounds')
+    """
+    if isinstance(source, (str, Path)):
+        path = source
+        source = lambda: iter_data_chunks(path, chunksize=chunksize)
+    
+    strategies = _resolve_strategy(strategy)
+    unsupported = {name for name in strategies.values() if name not in {'drop', 'mean', 'group_mean'}}
+    if unsupported:
+        raise ValueError(f"Strategy not supported out of core: {', '.join(sorted(unsupported))}")
+    if method not in ('iqr', 'zscore'):
+        raise ValueError(f"Unknown method: {method}")
+    group_keys = IMPUTATION_GROUP_KEYS if group_keys is None else list(group_keys)
+    outlier_columns = list(outlier_columns or [])
+    
+    # Pass 1: counts, group sums and outlier statistics
+    documentation = {
+        'original_n': 0,
+        'missing_by_variable': {},
+        'imputation_strategy': {},
+        'rows_removed': 0
+    }
+    columns = None
+    removed = {}
+    missing = {}
+    totals = {}
+    group_totals = None
+    sketches = {col: QuantileSketch(quantile_error) for col in outlier_columns}
+    moments = {col: np.zeros(3) for col in outlier_columns}
+    
+    for chunk in source():
+        documentation['original_n'] += len(chunk)
+        if columns is None:
+            columns = set(chunk.columns)
+        chunk, chunk_removed = _drop_missing(chunk, strategies)
+        for col, n in chunk_removed.items():
+            removed[col] = removed.get(col, 0) + n
+        
+        fill_cols = [col for col, name in strategies.items()
+                     if name in ('mean', 'group_mean') and col in chunk.columns]
+        for col in fill_cols:
+            values = chunk[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            observed = values[~np.isnan(values)]
+            missing[col] = missing.get(col, 0) + len(values) - len(observed)
+            total = totals.setdefault(col, np.zeros(2))
+            total += (observed.sum(), len(observed))
+        
+        group_cols = [col for col in fill_cols if strategies[col] == 'group_mean']
+        if group_cols:
+            grouped = chunk.groupby(group_keys, observed=True)[group_cols]
+            batch = pd.concat({'sum': grouped.sum(), 'count': grouped.count()}, axis=1)
+            group_totals = batch if group_totals is None else group_totals.add(batch, fill_value=0)
+        
+        for col in outlier_columns:
+            values = chunk[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            observed = values[~np.isnan(values)]
+            sketches[col].update(observed)
+            moments[col] += (len(observed), observed.sum(), np.square(observed).sum())
+    
+    columns = columns or set()
+    for col, name in strategies.items():
+        if col not in columns:
+            continue
+        if name == 'drop':
+            documentation['rows_removed'] += removed.get(col, 0)
+            documentation['missing_by_variable'][col] = f"Removed {removed.get(col, 0)} rows"
+        elif missing.get(col, 0) > 0:
+            documentation['missing_by_variable'][col] = missing[col]
+            documentation['imputation_strategy'][col] = (
+                'Overall mean' if name == 'mean'
+                else f"Group mean ({'×'.join(group_keys)}), then overall mean"
+            )
+    documentation['final_n'] = documentation['original_n'] - documentation['rows_removed']
+    
+    overall_means = {col: total[0] / total[1] if total[1] else np.nan
+                     for col, total in totals.items()}
+    group_means = None
+    if group_totals is not None:
+        group_means = group_totals['sum'] / group_totals['count']
+    
+    bounds = {}
+    for col in outlier_columns:
+        if method == 'iqr':
+            lower, upper = iqr_bounds(sketches[col], col, threshold)
+        else:
+            n, total, total_sq = moments[col]
+            mean = total / n if n else np.nan
+            std = np.sqrt(max(total_sq / n - mean ** 2, 0.0)) if n else np.nan
+            lower, upper = mean - threshold * std, mean + threshold * std
+        bounds[col] = (float(lower), float(upper))
+    documentation['outlier_bounds'] = bounds
+    
+    # Pass 2: apply drops, imputation and outlier flags chunk by chunk
+    def cleaned():
+        for chunk in source():
+            chunk, _ = _drop_missing(chunk, strategies)
+            chunk = chunk.copy()
+            for col, mean in overall_means.items():
+                values = chunk[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                fill = np.full(len(values), mean)
+                if group_means is not None and col in group_means.columns:
+                    keys = pd.MultiIndex.from_frame(chunk[group_keys].astype(object))
+                    group_fill = group_means[col].reindex(keys).to_numpy(dtype=np.float64)
+                    fill = np.where(np.isnan(group_fill), mean, group_fill)
+                filled = np.where(np.isnan(values), fill, values)
+                dtype = chunk[col].dtype
+                chunk[col] = filled.astype(dtype) if dtype.kind == 'f' else filled
+            for col, (lower, upper) in bounds.items():
+                values = chunk[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                chunk[f'{col}_outlier'] = (values < lower) | (values > upper)
+            yield chunk
+    
+    return cleaned(), documentation
+
+
+def _drop_missing(chunk, strategies):
+    """Drop rows missing any 'drop' column, counting removals per column in order."""
+    removed = {}
+    for col, name in strategies.items():
+        if name == 'drop' and col in chunk.columns:
+            keep = chunk[col].notna()
+            removed[col] = int((~keep).sum())
+            chunk = chunk[keep]
+    return chunk, removed
+
+
+def detect_outliers(df, column, method='iqr', threshold=1.5, quantile_error=None):
     """
     Detect outliers in a column.
     
@@ -82,6 +338,9 @@ def detect_outliers(df, column, method='iqr', threshold=1.5):
         Method: 'iqr', 'zscore'
     threshold : float
         Threshold for outlier detection
+    quantile_error : float, optional
+        If given, IQR quartiles come from a single-pass QuantileSketch with
+        this rank error instead of sorting the column
     
     Returns
     -------
@@ -89,16 +348,20 @@ def detect_outliers(df, column, method='iqr', threshold=1.5):
         Outlier information
     """
     if method == 'iqr':
-        Q1 = df[column].quantile(0.25)
-        Q3 = df[column].quantile(0.75)
-        IQR = Q3 - Q1
-        lower = Q1 - threshold * IQR
-        upper = Q3 + threshold * IQR
+        if quantile_error is None:
+            lower, upper = _iqr_fences(df[column].quantile(0.25), df[column].quantile(0.75), threshold)
+        else:
+            lower, upper = iqr_bounds(df, column, threshold, quantile_error)
         outliers = df[(df[column] < lower) | (df[column] > upper)]
     
     elif method == 'zscore':
-        z_scores = np.abs(stats.zscore(df[column].dropna()))
-        outliers = df[np.abs(stats.zscore(df[column].dropna())) > threshold]
+        # nan_policy='omit' keeps the scores aligned with df's rows
+        z_scores = np.abs(stats.zscore(df[column].to_numpy(dtype=np.float64, na_value=np.nan),
+                                       nan_policy='omit'))
+        outliers = df[z_scores > threshold]
+    
+    else:
+        raise ValueError(f"Unknown method: {method}")
     
     return {
         'column': column,
@@ -109,7 +372,410 @@ def detect_outliers(df, column, method='iqr', threshold=1.5):
     }
 
 
-def prepare_regression_data(df):
+def iqr_bounds(data, column, threshold=1.5, quantile_error=0.005):
+    """
+    IQR outlier bounds from one pass over a frame, chunks or a sketch.
+    
+    Parameters
+    ----------
+    data : pd.DataFrame, iterable of pd.DataFrame or QuantileSketch
+        Data to summarize; a prebuilt (e.g. merged per-partition) sketch
+        is used as is
+    column : str
+        Column name to check
+    threshold : float
+        IQR multiplier
+    quantile_error : float
+        Rank error of the QuantileSketch
+    
+    Returns
+    -------
+    tuple
+        (lower, upper) bounds
+    """
+    if isinstance(data, QuantileSketch):
+        sketch = data
+    else:
+        sketch = QuantileSketch(quantile_error)
+        frames = [data] if isinstance(data, pd.DataFrame) else data
+        for chunk in frames:
+            sketch.update(chunk[column].to_numpy(dtype=np.float64, na_value=np.nan))
+    
+    q1, q3 = sketch.quantile([0.25, 0.75])
+    return _iqr_fences(q1, q3, threshold)
+
+
+def _iqr_fences(q1, q3, threshold):
+    """Tukey fences for the given quartiles."""
+    iqr = q3 - q1
+    return q1 - threshold * iqr, q3 + threshold * iqr
+
+
+def detect_outliers_batch(df, columns=None, method='iqr', threshold=1.5, groupby=None):
+    """
+    Detect outliers in many columns in one vectorized pass.
+    
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Input dataset
+    columns : list, optional
+        Columns to check (default all numeric columns)
+    method : str
+        Method: 'iqr', 'zscore'
+    threshold : float
+        Threshold for outlier detection
+    groupby : str or list, optional
+        Compute bounds within groups (e.g. ['Barangay', 'Crop'])
+    
+    Returns
+    -------
+    dict
+        'flags': boolean DataFrame (rows × columns) marking outliers;
+        'summary': per-column outlier counts and percentages
+    """
+    if method not in ('iqr', 'zscore'):
+        raise ValueError(f"Unknown method: {method}")
+    if columns is None:
+        columns = [col for col in df.select_dtypes(include='number').columns
+                   if not pd.api.types.is_bool_dtype(df[col])]
+    columns = list(columns)
+    
+    values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    if groupby is None:
+        if method == 'iqr':
+            q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+        else:
+            center = np.nanmean(values, axis=0)
+            spread = np.nanstd(values, axis=0)
+    else:
+        keys = [groupby] if isinstance(groupby, str) else list(groupby)
+        grouped = df.groupby(keys, observed=True, sort=False)
+        codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        
+        def broadcast(table):
+            # Code -1 marks rows with a missing group key; they are never flagged
+            table = table.to_numpy(dtype=np.float64)
+            return np.vstack([table, np.full((1, len(columns)), np.nan)])[codes]
+        
+        if method == 'iqr':
+            q1 = broadcast(grouped[columns].quantile(0.25))
+            q3 = broadcast(grouped[columns].quantile(0.75))
+        else:
+            center = broadcast(grouped[columns].mean())
+            spread = broadcast(grouped[columns].std(ddof=0))
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if method == 'iqr':
+            iqr = q3 - q1
+            flags = (values < q1 - threshold * iqr) | (values > q3 + threshold * iqr)
+        else:
+            flags = np.abs(values - center) / spread > threshold
+    
+    n_outliers = flags.sum(axis=0)
+    summary = pd.DataFrame({
+        'method': method,
+        'n_outliers': n_outliers,
+        'pct_outliers': n_outliers / len(df) * 100 if len(df) else np.nan
+    }, index=pd.Index(columns, name='column'))
+    
+    return {
+        'flags': pd.DataFrame(flags, index=df.index, columns=columns),
+        'summary': summary
+    }
+
+
+class CategoricalEncoder:
+    """
+    Treatment (dummy) encoder that remembers its category levels.
+    
+    Fit once on the modelling data, then reuse the same encoder on new
+    data so prediction designs always have the fitted columns. The
+    reference level of each column gets no dummy (as drop_first=True).
+    
+    Parameters
+    ----------
+    columns : list
+        Categorical columns to encode, in output order
+    reference : dict, optional
+        Reference level per column (default: first level)
+    handle_unknown : str
+        'error' to reject levels unseen during fit, 'ignore' to encode
+        them as all zeros
+    """
+    
+    def __init__(self, columns=('Crop', 'Barangay'), reference=None, handle_unknown='error'):
+        if handle_unknown not in ('error', 'ignore'):
+            raise ValueError(f"Unknown handle_unknown: {handle_unknown}")
+        self.columns = list(columns)
+        self.reference = dict(reference or {})
+        self.handle_unknown = handle_unknown
+        self.levels_ = None
+        self.reference_ = None
+    
+    def fit(self, df):
+        """
+        Learn the levels of each column.
+        
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Data containing the categorical columns
+        
+        Returns
+        -------
+        CategoricalEncoder
+            self
+        """
+        self.levels_ = {}
+        self.reference_ = {}
+        for col in self.columns:
+            values = df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                levels = list(values.cat.categories)
+            else:
+                levels = sorted(values.dropna().unique())
+            reference = self.reference.get(col, levels[0] if levels else None)
+            if reference not in levels:
+                raise ValueError(f"Reference level {reference!r} not found in column {col}")
+            self.levels_[col] = levels
+            self.reference_[col] = reference
+        return self
+    
+    @property
+    def feature_names_(self):
+        """Names of the encoded columns, e.g. 'Crop_Corn'."""
+        self._check_fitted()
+        return [f"{col}_{level}" for col in self.columns
+                for level in self.levels_[col] if level != self.reference_[col]]
+    
+    def _check_fitted(self):
+        if self.levels_ is None:
+            raise RuntimeError("CategoricalEncoder is not fitted; call fit() first")
+    
+    def transform(self, df):
+        """
+        Encode data as a sparse dummy block.
+        
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Data containing the categorical columns
+        
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            n_rows × len(feature_names_) matrix with one non-zero per
+            non-reference value
+        """
+        from scipy import sparse
+        
+        self._check_fitted()
+        rows, cols = [], []
+        offset = 0
+        for col in self.columns:
+            levels = self.levels_[col]
+            codes = pd.Categorical(df[col], categories=levels).codes
+            unknown = (codes < 0) & df[col].notna().to_numpy()
+            if unknown.any() and self.handle_unknown == 'error':
+                unseen = sorted(map(str, pd.unique(df[col].to_numpy()[unknown])))
+                raise ValueError(f"Unseen levels in column {col}: {', '.join(unseen)}")
+            
+            # Map level codes to output columns, skipping the reference level
+            ref_code = levels.index(self.reference_[col])
+            position = np.arange(len(levels)) - (np.arange(len(levels)) > ref_code)
+            position[ref_code] = -1
+            position = np.append(position, -1)  # code -1: missing or unknown
+            out = position[codes]
+            hit = np.flatnonzero(out >= 0)
+            rows.append(hit)
+            cols.append(out[hit] + offset)
+            offset += len(levels) - 1
+        
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+        return sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(df), offset))
+    
+    def fit_transform(self, df):
+        """Fit on df and return its sparse dummy block."""
+        return self.fit(df).transform(df)
+    
+    def transform_frame(self, df, sparse=False):
+        """
+        Encode data as a DataFrame of dummy columns aligned with df.
+        
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Data containing the categorical columns
+        sparse : bool
+            Return pandas sparse columns instead of dense booleans
+        
+        Returns
+        -------
+        pd.DataFrame
+            Dummy columns named as feature_names_
+        """
+        block = self.transform(df)
+        if sparse:
+            return pd.DataFrame.sparse.from_spmatrix(block.astype(bool), index=df.index,
+                                                     columns=self.feature_names_)
+        return pd.DataFrame(block.toarray().astype(bool), index=df.index, columns=self.feature_names_)
+
+
+class FertilizerProductEncoder:
+    """
+    Multi-hot encoder for delimited fertilizer product lists.
+    
+    Parses values such as "14-14-14;ammonium sulfate;urea, foliar" into
+    normalized product tokens (lower case, trimmed, single spaces, optional
+    aliases). The product vocabulary is fixed at fit time and reused for
+    new data. Parsing is vectorized over the column with pandas string
+    methods; there is no Python loop per row.
+    
+    Parameters
+    ----------
+    column : str
+        Column holding the product lists
+    delimiters : str
+        Characters separating products
+    aliases : dict, optional
+        Mapping of normalized token to canonical product name
+    min_count : int
+        Minimum number of rows a product must appear in to be kept
+    handle_unknown : str
+        'ignore' to drop products unseen during fit, 'error' to reject them
+    prefix : str
+        Prefix for the encoded column names
+    """
+    
+    def __init__(self, column='fertilizer_type_extracted', delimiters=';,', aliases=None,
+                 min_count=1, handle_unknown='ignore', prefix='fert'):
+        if handle_unknown not in ('error', 'ignore'):
+            raise ValueError(f"Unknown handle_unknown: {handle_unknown}")
+        self.column = column
+        self.delimiters = delimiters
+        self.aliases = dict(aliases or {})
+        self.min_count = min_count
+        self.handle_unknown = handle_unknown
+        self.prefix = prefix
+        self.vocabulary_ = None
+    
+    def _tokens(self, data):
+        """
+        Factorize the column and tokenize each distinct product list once.
+        
+        Returns the per-row codes of the distinct lists (-1 for missing),
+        the number of distinct lists, and (list, token) pairs.
+        """
+        values = data[self.column] if isinstance(data, pd.DataFrame) else data
+        codes, uniques = pd.factorize(values.to_numpy(dtype=object))
+        uniques = pd.Series(uniques, dtype=object)
+        
+        pattern = f"[{re.escape(self.delimiters)}]"
+        tokens = (uniques.str.lower()
+                  .str.split(pattern, regex=True)
+                  .explode()
+                  .str.strip()
+                  .str.replace(r'\s+', ' ', regex=True))
+        tokens = tokens[tokens.notna() & (tokens != '')]
+        if self.aliases:
+            tokens = tokens.replace(self.aliases)
+        # A product listed twice in one row still counts once
+        pairs = pd.DataFrame({'list': tokens.index.to_numpy(), 'token': tokens.to_numpy()})
+        return codes, len(uniques), pairs.drop_duplicates()
+    
+    def fit(self, data):
+        """
+        Learn the product vocabulary.
+        
+        Parameters
+        ----------
+        data : pd.DataFrame or pd.Series
+            Data containing the product lists
+        
+        Returns
+        -------
+        FertilizerProductEncoder
+            self
+        """
+        codes, n_lists, pairs = self._tokens(data)
+        rows_per_list = np.bincount(codes[codes >= 0], minlength=n_lists)
+        counts = pd.Series(rows_per_list[pairs['list'].to_numpy()]).groupby(pairs['token'].to_numpy()).sum()
+        self.vocabulary_ = sorted(counts.index[counts >= self.min_count])
+        return self
+    
+    @property
+    def feature_names_(self):
+        """Names of the encoded columns, e.g. 'fert_urea'."""
+        self._check_fitted()
+        return [f"{self.prefix}_{token}" for token in self.vocabulary_]
+    
+    def _check_fitted(self):
+        if self.vocabulary_ is None:
+            raise RuntimeError("FertilizerProductEncoder is not fitted; call fit() first")
+    
+    def transform(self, data):
+        """
+        Encode product lists as a sparse multi-hot matrix.
+        
+        Parameters
+        ----------
+        data : pd.DataFrame or pd.Series
+            Data containing the product lists
+        
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            n_rows × len(vocabulary_) matrix of 0/1 product indicators
+        """
+        from scipy import sparse
+        
+        self._check_fitted()
+        codes, n_lists, pairs = self._tokens(data)
+        token_codes = pd.Categorical(pairs['token'], categories=self.vocabulary_).codes
+        known = token_codes >= 0
+        if not known.all() and self.handle_unknown == 'error':
+            unseen = sorted(pairs['token'][~known].unique())
+            raise ValueError(f"Unseen fertilizer products: {', '.join(unseen)}")
+        
+        # Encode each distinct list once, plus an empty last row for missing
+        # values (code -1), then gather rows by code
+        lists = pairs['list'].to_numpy()[known]
+        by_list = sparse.csr_matrix((np.ones(len(lists)), (lists, token_codes[known])),
+                                    shape=(n_lists + 1, len(self.vocabulary_)))
+        return by_list[codes]
+    
+    def fit_transform(self, data):
+        """Fit on data and return its sparse multi-hot matrix."""
+        return self.fit(data).transform(data)
+    
+    def transform_frame(self, data, sparse=False):
+        """
+        Encode product lists as a DataFrame of indicator columns.
+        
+        Parameters
+        ----------
+        data : pd.DataFrame or pd.Series
+            Data containing the product lists
+        sparse : bool
+            Return pandas sparse columns instead of dense booleans
+        
+        Returns
+        -------
+        pd.DataFrame
+            Indicator columns named as feature_names_, aligned with data
+        """
+        block = self.transform(data)
+        if sparse:
+            return pd.DataFrame.sparse.from_spmatrix(block.astype(bool), index=data.index,
+                                                     columns=self.feature_names_)
+        return pd.DataFrame(block.toarray().astype(bool), index=data.index,
+                            columns=self.feature_names_)
+
+
+def prepare_regression_data(df, encoder=None, sparse=False, copy=True):
     """
     Prepare data for regression analysis with proper encoding.
     
@@ -117,21 +783,35 @@ def prepare_regression_data(df):
     ----------
     df : pd.DataFrame
         Cleaned dataset
+    encoder : CategoricalEncoder, optional
+        Fitted encoder to reuse (e.g. the one used for the training data);
+        by default a new one is fitted on Crop and Barangay
+    sparse : bool
+        Store the dummy columns as pandas sparse columns; the regression
+        functions densify the ones a formula uses. For a design that stays
+        sparse end to end, use encoder.transform() (CSR matrix)
+    copy : bool
+        Copy the input columns into the result; False shares them with df
+        and only allocates the dummy columns
     
     Returns
     -------
     pd.DataFrame
-        Dataset with encoded variables ready for regression
+        Dataset with encoded variables ready for regression; the encoder
+        used is kept in df_reg.attrs['encoder'] for encoding new data
+        (make_prediction(..., encoder=df_reg.attrs['encoder']))
     """
-    df_reg = df.copy()
-    
-    # Create dummy variables for Crop (with drop_first=True for reference category)
-    crop_dummies = pd.get_dummies(df_reg['Crop'], prefix='Crop', drop_first=True)
-    df_reg = pd.concat([df_reg, crop_dummies], axis=1)
+    if encoder is None:
+        # Crop and Barangay dummies, first level as reference category
+        encoder = CategoricalEncoder(['Crop', 'Barangay']).fit(df)
     
-    # Create dummy variables for Barangay (optional, for advanced models)
-    barangay_dummies = pd.get_dummies(df_reg['Barangay'], prefix='Barangay', drop_first=True)
-    df_reg = pd.concat([df_reg, barangay_dummies], axis=1)
+    dummies = encoder.transform_frame(df, sparse=sparse)
+    if copy:
+        df_reg = pd.concat([df, dummies], axis=1)
+    else:
+        df_reg = df.copy(deep=False)
+        df_reg[dummies.columns] = dummies
+    df_reg.attrs['encoder'] = encoder
     
     return df_reg
 
@@ -3,12 +3,49 @@ Data Loading Module
 Handles loading and initial validation of soil pH research data from Excel or CSV formats.
 """
 
+import glob
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from .streaming import SummaryAccumulator, SiteAggregates
 
-def load_data(filepath):
+
+REQUIRED_COLUMNS = ['pH_reading', 'Barangay', 'Crop',
+                    'fertilizer_kg_ha', 'years_planted', 'lime_applied']
+
+FLAG_COLUMNS = ['lime_applied', 'organic_fertilizer', 'crop_cassava', 'crop_corn']
+
+# Compact dtypes for streaming mode; columns absent from a file are ignored
+DTYPE_SCHEMA = {
+    'Barangay': 'category',
+    'Crop': 'category',
+    'pH_reading': 'float32',
+    'fertilizer_kg_ha': 'float32',
+    'years_planted': 'float32',
+    **{col: 'Int8' for col in FLAG_COLUMNS}
+}
+
+# Declarative row-level rules evaluated by validate_rows. Each rule flags a
+# row when its check fails; missing values are left to the cleaning stage.
+ROW_RULES = [
+    {'name': 'ph_out_of_range', 'check': 'range', 'column': 'pH_reading', 'min': 0, 'max': 14},
+    {'name': 'negative_fertilizer', 'check': 'range', 'column': 'fertilizer_kg_ha', 'min': 0},
+    {'name': 'lime_not_binary', 'check': 'binary', 'column': 'lime_applied'},
+    {'name': 'organic_not_binary', 'check': 'binary', 'column': 'organic_fertilizer'},
+    {'name': 'site_id_mismatch', 'check': 'site_id',
+     'columns': ['Site_Id', 'Barangay', 'Crop', 'reading_index']}
+]
+
+# Bump when the parsing logic changes so stale cache entries are ignored
+CACHE_VERSION = 1
+
+
+def load_data(filepath, chunksize=None, dtype=None, cache_dir=None):
     """
     Load research data from Excel or CSV file.
     
@@ -16,11 +53,23 @@ def load_data(filepath):
     ----------
     filepath : str
         Path to the data file (CSV or Excel)
+    chunksize : int, optional
+        If given, return an iterator of DataFrames with at most this many
+        rows each instead of a single DataFrame (streaming mode)
+    dtype : dict, optional
+        Column dtypes to apply while parsing. Streaming mode defaults to
+        DTYPE_SCHEMA; whole-file loads default to pandas inference
+    cache_dir : str, optional
+        Directory for the parsed-data cache. When given, whole-file loads
+        are stored as Arrow IPC files keyed by the resolved path, loader
+        options and content hash, and memory-mapped back on later loads.
+        Frames with no Arrow representation are returned uncached
     
     Returns
     -------
-    pd.DataFrame
-        Loaded dataset with initial validation
+    pd.DataFrame or iterator of pd.DataFrame
+        Loaded dataset with initial validation, or typed chunks when
+        chunksize is given
     
     Raises
     ------
@@ -29,72 +78,473 @@ def load_data(filepath):
     ValueError
         If file format is unsupported
     """
+    filepath = _check_data_file(filepath)
+    
+    if chunksize is not None:
+        return iter_data_chunks(filepath, chunksize=chunksize, dtype=dtype)
+    
+    if cache_dir is not None:
+        return _load_cached(filepath, dtype, Path(cache_dir))
+    
+    return _read_file(filepath, dtype)
+
+
+def iter_data_chunks(filepath, chunksize=50000, dtype=None):
+    """
+    Stream research data as typed chunks.
+    
+    Peak memory depends on chunksize rather than file size. Categorical
+    columns are inferred per chunk, so chunk categories may differ.
+    
+    Parameters
+    ----------
+    filepath : str
+        Path to the data file (CSV or Excel)
+    chunksize : int
+        Maximum number of rows per chunk
+    dtype : dict, optional
+        Column dtypes (default DTYPE_SCHEMA)
+    
+    Yields
+    ------
+    pd.DataFrame
+        Chunk of the dataset with the schema applied
+    """
+    filepath = _check_data_file(filepath)
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be positive, got {chunksize}")
+    schema = DTYPE_SCHEMA if dtype is None else dtype
+    
+    if filepath.suffix.lower() == '.csv':
+        with pd.read_csv(filepath, chunksize=chunksize, dtype=schema) as reader:
+            yield from reader
+    else:
+        yield from _iter_excel_chunks(filepath, chunksize, schema)
+
+
+def load_many(source, sheet_name=None, dtype=None, n_workers=None,
+              source_column='source'):
+    """
+    Load and combine many data files or workbook sheets in parallel.
+    
+    Parameters
+    ----------
+    source : str or list
+        Glob pattern, directory, single workbook, or list of file paths
+    sheet_name : str or list, optional
+        Workbook sheets to read (default all sheets of every workbook)
+    dtype : dict, optional
+        Column dtypes to apply while parsing each part
+    n_workers : int, optional
+        Worker processes (default os.cpu_count(); 1 parses serially)
+    source_column : str, optional
+        Column recording the file (and sheet) each row came from; None to skip
+    
+    Returns
+    -------
+    pd.DataFrame
+        Concatenated dataset
+    
+    Raises
+    ------
+    FileNotFoundError
+        If the source matches no supported files
+    ValueError
+        If any part is missing required columns
+    """
+    tasks = _expand_sources(source, sheet_name)
+    if not tasks:
+        raise FileNotFoundError(f"No CSV or Excel files found for: {source}")
+    
+    n_workers = min(n_workers or os.cpu_count() or 1, len(tasks))
+    if n_workers == 1:
+        parts = [_read_part(task, dtype) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            parts = list(pool.map(_read_part, tasks, [dtype] * len(tasks)))
+    
+    missing = {}
+    for (filepath, sheet), part in zip(tasks, parts):
+        absent = [col for col in REQUIRED_COLUMNS if col not in part.columns]
+        if absent:
+            missing[_part_label(filepath, sheet)] = absent
+    if missing:
+        details = '; '.join(f"{label}: {cols}" for label, cols in missing.items())
+        raise ValueError(f"Required columns missing from input parts - {details}")
+    
+    if source_column is not None:
+        for (filepath, sheet), part in zip(tasks, parts):
+            part[source_column] = _part_label(filepath, sheet)
+    
+    return _concat_parts(parts)
+
+
+def append_readings(new_data, store_dir, archive_path=None):
+    """
+    Ingest a batch of new readings and update the persisted site aggregates.
+    
+    Only the batch is read; the per-site and per-Barangay×Crop running
+    aggregates in store_dir are updated in place (see SiteAggregates).
+    
+    Parameters
+    ----------
+    new_data : str, pd.DataFrame or iterable of pd.DataFrame
+        Path to a file of new readings, or the readings themselves
+    store_dir : str
+        Directory holding the persisted aggregates
+    archive_path : str, optional
+        CSV file the raw readings are appended to (its directory is
+        created if needed)
+    
+    Returns
+    -------
+    SiteAggregates
+        Updated aggregates
+    """
+    if isinstance(new_data, (str, Path)):
+        new_data = load_data(new_data)
+    
+    aggregates = SiteAggregates.load(store_dir)
+    if archive_path is not None:
+        # The archive may live inside store_dir, which save() creates later
+        Path(archive_path).parent.mkdir(parents=True, exist_ok=True)
+    for chunk in _iter_frames(new_data):
+        aggregates.append(chunk)
+        if archive_path is not None:
+            write_header = not Path(archive_path).exists()
+            chunk.to_csv(archive_path, mode='a', header=write_header, index=False)
+    aggregates.save(store_dir)
+    
+    return aggregates
+
+
+def _check_data_file(filepath):
+    """Resolve a data file path and check it exists with a supported format."""
     filepath = Path(filepath)
     
     if not filepath.exists():
         raise FileNotFoundError(f"Data file not found: {filepath}")
     
+    if filepath.suffix.lower() not in ['.csv', '.xlsx', '.xls']:
+        raise ValueError(f"Unsupported file format: {filepath.suffix}")
+    
+    return filepath
+
+
+def _read_file(filepath, dtype):
+    """Parse a whole CSV or Excel file into a DataFrame."""
     if filepath.suffix.lower() == '.csv':
-        df = pd.read_csv(filepath)
-    elif filepath.suffix.lower() in ['.xlsx', '.xls']:
-        df = pd.read_excel(filepath)
+        return pd.read_csv(filepath, dtype=dtype)
+    return pd.read_excel(filepath, dtype=dtype)
+
+
+def _file_digest(filepath, block_size=1 << 20):
+    """SHA-256 of the file contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as fh:
+        for block in iter(lambda: fh.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_key(filepath, dtype):
+    """
+    Cache keys for a file: (source, content).
+    
+    The source key identifies the resolved path and loader options, so
+    entries for the same source can be found and pruned when its content
+    changes; the content key is the file's content hash.
+    """
+    options = json.dumps({'version': CACHE_VERSION, 'dtype': dtype,
+                          'path': str(filepath.resolve())},
+                         sort_keys=True, default=str)
+    source = hashlib.sha256(options.encode()).hexdigest()[:16]
+    return source, _file_digest(filepath)[:32]
+
+
+def _load_cached(filepath, dtype, cache_dir):
+    """Load a file through the Arrow IPC cache, (re)building the entry on a miss."""
+    import pyarrow as pa
+    
+    source, content = _cache_key(filepath, dtype)
+    cache_path = cache_dir / f"{filepath.stem}-{source}-{content}.arrow"
+    
+    if not cache_path.exists():
+        df = _read_file(filepath, dtype)
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except pa.ArrowException:
+            # Mixed-type object columns have no Arrow type; serve uncached
+            return df
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Entries for an older version of this source file are now stale
+        for stale in cache_dir.glob(f"{filepath.stem}-{source}-{'?' * 32}.arrow"):
+            if stale != cache_path:
+                stale.unlink(missing_ok=True)
+        
+        tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        with pa.OSFile(str(tmp_path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, cache_path)
+    
+    with pa.memory_map(str(cache_path), 'r') as source_file:
+        table = pa.ipc.open_file(source_file).read_all()
+    
+    return table.to_pandas()
+
+
+def _iter_excel_chunks(filepath, chunksize, schema):
+    """Read the first worksheet row by row, yielding typed DataFrames."""
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(col) for col in header]
+        dtypes = {col: dt for col, dt in schema.items() if col in columns}
+        
+        buffer = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) == chunksize:
+                yield pd.DataFrame.from_records(buffer, columns=columns).astype(dtypes)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame.from_records(buffer, columns=columns).astype(dtypes)
+    finally:
+        workbook.close()
+
+
+def _expand_sources(source, sheet_name):
+    """Resolve a load_many source into (filepath, sheet) tasks."""
+    if isinstance(source, (list, tuple)):
+        paths = [Path(p) for p in source]
+    elif Path(source).is_dir():
+        paths = sorted(p for p in Path(source).iterdir()
+                       if p.suffix.lower() in ['.csv', '.xlsx', '.xls'])
+    elif Path(source).exists():
+        paths = [Path(source)]
     else:
-        raise ValueError(f"Unsupported file format: {filepath.suffix}")
+        paths = [Path(p) for p in sorted(glob.glob(str(source)))]
+    
+    tasks = []
+    for filepath in paths:
+        filepath = _check_data_file(filepath)
+        if filepath.suffix.lower() == '.csv':
+            tasks.append((filepath, None))
+            continue
+        if sheet_name is None:
+            with pd.ExcelFile(filepath) as workbook:
+                sheets = workbook.sheet_names
+        elif isinstance(sheet_name, str):
+            sheets = [sheet_name]
+        else:
+            sheets = list(sheet_name)
+        tasks.extend((filepath, sheet) for sheet in sheets)
     
-    return df
+    return tasks
 
 
-def validate_dataset(df):
+def _read_part(task, dtype):
+    """Parse one (filepath, sheet) task; runs inside a worker process."""
+    filepath, sheet = task
+    if sheet is None:
+        return pd.read_csv(filepath, dtype=dtype)
+    return pd.read_excel(filepath, sheet_name=sheet, dtype=dtype)
+
+
+def _part_label(filepath, sheet):
+    """Human-readable name for a file or workbook sheet."""
+    return filepath.name if sheet is None else f"{filepath.name}:{sheet}"
+
+
+def _concat_parts(parts):
+    """Concatenate parts once, unifying categorical levels so they stay categorical."""
+    categorical = {col for part in parts for col, dt in part.dtypes.items()
+                   if isinstance(dt, pd.CategoricalDtype)}
+    for col in categorical:
+        levels = pd.Index([])
+        for part in parts:
+            if col in part.columns:
+                levels = levels.union(pd.Index(part[col].astype('category').cat.categories))
+        for part in parts:
+            if col in part.columns:
+                part[col] = part[col].astype(pd.CategoricalDtype(levels))
+    
+    return pd.concat(parts, ignore_index=True)
+
+
+def _iter_frames(data):
+    """Yield DataFrames from a single DataFrame or an iterable of chunks."""
+    if isinstance(data, pd.DataFrame):
+        yield data
+    else:
+        yield from data
+
+
+def _observe_structure(frames, structure):
+    """Pass chunks through while recording row count and column names."""
+    for chunk in frames:
+        structure['n_rows'] += len(chunk)
+        if not structure['columns']:
+            structure['columns'] = chunk.columns.tolist()
+        yield chunk
+
+
+def validate_dataset(df, check_rows=False, rules=None):
     """
     Validate loaded dataset structure and content.
     
     Parameters
     ----------
-    df : pd.DataFrame
-        Loaded dataset
+    df : pd.DataFrame or iterable of pd.DataFrame
+        Loaded dataset, or chunks from load_data(..., chunksize=n)
+    check_rows : bool
+        Also run the row-level rules (see validate_rows) in the same pass
+    rules : list of dict, optional
+        Row rules to apply when check_rows is True (default ROW_RULES)
     
     Returns
     -------
     dict
-        Validation report with structure information
+        Validation report with structure information, plus 'row_validation'
+        when check_rows is True
     """
-    required_columns = ['pH_reading', 'Barangay', 'Crop', 
-                       'fertilizer_kg_ha', 'years_planted', 'lime_applied']
+    structure = {'n_rows': 0, 'columns': []}
+    frames = _observe_structure(_iter_frames(df), structure)
     
+    if check_rows:
+        row_validation = validate_rows(frames, rules=rules)
+    else:
+        for _ in frames:
+            pass
+    
+    columns = structure['columns']
     report = {
-        'n_rows': len(df),
-        'n_cols': len(df.columns),
-        'columns': df.columns.tolist(),
+        'n_rows': structure['n_rows'],
+        'n_cols': len(columns),
+        'columns': columns,
         'missing_required': []
     }
     
-    for col in required_columns:
-        if col not in df.columns:
+    for col in REQUIRED_COLUMNS:
+        if col not in columns:
             report['missing_required'].append(col)
     
+    if check_rows:
+        report['row_validation'] = row_validation
+    
     return report
 
 
+def validate_rows(df, rules=None):
+    """
+    Check every row against declarative validation rules.
+    
+    All rules are evaluated with vectorized NumPy operations, one pass per
+    chunk. Rule i sets bit i of the row's violation mask.
+    
+    Parameters
+    ----------
+    df : pd.DataFrame or iterable of pd.DataFrame
+        Dataset or chunks to validate
+    rules : list of dict, optional
+        Rules with 'name', 'check' ('range', 'binary' or 'site_id') and the
+        column(s) they apply to (default ROW_RULES)
+    
+    Returns
+    -------
+    dict
+        Per-row violation bitmask, rule names, violation counts per rule,
+        number of invalid rows and rules skipped for missing columns
+    """
+    rules = ROW_RULES if rules is None else rules
+    if len(rules) > 64:
+        raise ValueError(f"At most 64 rules are supported, got {len(rules)}")
+    mask_dtype = next(dt for dt in (np.uint8, np.uint16, np.uint32, np.uint64)
+                      if np.iinfo(dt).bits >= len(rules))
+    
+    masks = []
+    counts = np.zeros(len(rules), dtype=np.int64)
+    skipped = set()
+    for chunk in _iter_frames(df):
+        mask = np.zeros(len(chunk), dtype=mask_dtype)
+        for bit, rule in enumerate(rules):
+            failed = _evaluate_rule(chunk, rule)
+            if failed is None:
+                skipped.add(rule['name'])
+                continue
+            counts[bit] += np.count_nonzero(failed)
+            mask |= failed.astype(mask_dtype) << mask_dtype(bit)
+        masks.append(mask)
+    
+    violation_mask = np.concatenate(masks) if masks else np.zeros(0, dtype=mask_dtype)
+    
+    return {
+        'violation_mask': violation_mask,
+        'rule_names': [rule['name'] for rule in rules],
+        'violation_counts': {rule['name']: int(n) for rule, n in zip(rules, counts)},
+        'n_invalid_rows': int(np.count_nonzero(violation_mask)),
+        'skipped_rules': [rule['name'] for rule in rules if rule['name'] in skipped]
+    }
+
+
+def _evaluate_rule(chunk, rule):
+    """Boolean array of rows failing a rule, or None if its columns are absent."""
+    columns = rule.get('columns', [rule.get('column')])
+    if any(col not in chunk.columns for col in columns):
+        return None
+    
+    check = rule['check']
+    if check == 'range':
+        values = chunk[rule['column']].to_numpy(dtype=np.float64, na_value=np.nan)
+        failed = np.zeros(len(values), dtype=bool)
+        if rule.get('min') is not None:
+            failed |= values < rule['min']
+        if rule.get('max') is not None:
+            failed |= values > rule['max']
+        return failed
+    
+    if check == 'binary':
+        values = chunk[rule['column']].to_numpy(dtype=np.float64, na_value=np.nan)
+        return ~np.isnan(values) & (values != 0) & (values != 1)
+    
+    if check == 'site_id':
+        # Site_Id is expected to read '<Barangay>_<Crop>_<reading_index>'
+        site_col, barangay_col, crop_col, index_col = columns
+        expected = (chunk[barangay_col].astype(str) + '_' + chunk[crop_col].astype(str)
+                    + '_' + chunk[index_col].astype(str))
+        actual = chunk[site_col].astype(str)
+        return (actual.str.lower() != expected.str.lower()).to_numpy()
+    
+    raise ValueError(f"Unknown rule check: {check}")
+
+
 def get_data_summary(df):
     """
     Get comprehensive summary of loaded data.
     
+    Computed in a single pass with O(columns) memory, so chunk iterators
+    from load_data(..., chunksize=n) can be summarized directly. Use
+    SummaryAccumulator to combine summaries of separate partitions.
+    
     Parameters
     ----------
-    df : pd.DataFrame
-        Loaded dataset
+    df : pd.DataFrame or iterable of pd.DataFrame
+        Loaded dataset, or chunks from load_data(..., chunksize=n)
     
     Returns
     -------
     dict
         Summary statistics and info
     """
-    summary = {
-        'n_observations': len(df),
-        'n_features': len(df.columns),
-        'dtypes': df.dtypes.to_dict(),
-        'missing_counts': df.isnull().sum().to_dict(),
-        'missing_pct': (df.isnull().sum() / len(df) * 100).to_dict()
-    }
+    accumulator = SummaryAccumulator()
+    for chunk in _iter_frames(df):
+        accumulator.update(chunk)
     
-    return summary
+    return accumulator.result()
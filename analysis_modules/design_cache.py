@@ -0,0 +1,135 @@
+"""
+Design Cache Module
+Reuses encoded formula terms across regression fits on the same data.
+"""
+
+from collections import OrderedDict
+
+import pandas as pd
+import numpy as np  # available to formula terms such as np.log1p(x)
+import patsy
+
+
+class DesignCache:
+    """
+    LRU cache of patsy design blocks keyed by data fingerprint and term.
+    
+    Fitting many formulas against the same cleaned data re-evaluates and
+    re-encodes shared terms such as C(Crop) and C(Barangay) on every call.
+    With a cache, each term's columns are built once per dataset and
+    coding (the coding of a categorical depends on the other terms, so the
+    term's column names are part of the key) and every later formula is
+    assembled from cached blocks.
+    
+    Parameters
+    ----------
+    max_entries : int
+        Maximum number of cached term blocks and design layouts; the least
+        recently used entries are evicted first
+    
+    Examples
+    --------
+    >>> cache = DesignCache()
+    >>> for formula in formulas:
+    ...     model = fit_multiple_regression(df, formula, design_cache=cache)
+    """
+    
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._prepared = (None, None)
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def clear(self):
+        """Drop all cached entries and counters."""
+        self._entries.clear()
+        self._prepared = (None, None)
+        self.hits = self.misses = 0
+    
+    def _get(self, key, build):
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        self.misses += 1
+        value = build()
+        self._entries[key] = value
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+    
+    def prepared_data(self, df):
+        """
+        Fingerprint df and return it with text columns as shared categoricals.
+        
+        Sorted categories reproduce patsy's default level order, while the
+        categorical codes let patsy skip its per-element level handling.
+        The prepared frame is kept for the most recent fingerprint.
+        """
+        fingerprint = data_fingerprint(df)
+        if self._prepared[0] != fingerprint:
+            text = df.select_dtypes(include=['category', 'object', 'string']).columns
+            prepared = df.reset_index(drop=True)
+            prepared = prepared.astype({
+                col: pd.CategoricalDtype(sorted(prepared[col].dropna().unique())) for col in text
+            })
+            self._prepared = (fingerprint, prepared)
+        return self._prepared
+    
+    def design(self, df, formula):
+        """
+        Response and design matrices for formula, assembled from cached terms.
+        
+        Rows with missing values in any term are dropped, as with
+        statsmodels' formula interface.
+        
+        Returns
+        -------
+        tuple
+            (y, X, design_info) where y and X are DataFrames indexed like df
+            and design_info is the patsy DesignInfo of X
+        """
+        fingerprint, prepared = self.prepared_data(df)
+        y_info, x_info = self._get(('layout', fingerprint, formula),
+                                   lambda: _design_layout(prepared, formula))
+        
+        blocks = [self._term_block(fingerprint, prepared, info, term)
+                  for info in (y_info, x_info) for term in info.terms]
+        design = pd.concat(blocks, axis=1, join='inner')
+        
+        y = design[y_info.column_names]
+        X = design[x_info.column_names]
+        y.index = X.index = df.index[X.index]
+        return y, X, x_info
+    
+    def _term_block(self, fingerprint, prepared, design_info, term):
+        columns = tuple(design_info.column_names[design_info.slice(term)])
+        
+        def build():
+            (block,) = patsy.build_design_matrices([design_info.subset([term])], prepared,
+                                                   NA_action='drop', return_type='dataframe')
+            return block
+        
+        return self._get(('term', fingerprint, term.name(), columns), build)
+
+
+def data_fingerprint(df):
+    """Content hash of a DataFrame's values, column names, dtypes and index."""
+    values = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    header = pd.util.hash_pandas_object(
+        pd.Series([f'{col}:{dtype}' for col, dtype in df.dtypes.items()]), index=False
+    ).to_numpy()
+    return hash((len(df), values.tobytes(), header.tobytes()))
+
+
+def _design_layout(data, formula):
+    """Patsy DesignInfos (response, predictors) for formula on data."""
+    desc = patsy.ModelDesc.from_formula(formula)
+    return patsy.design_matrix_builders([desc.lhs_termlist, desc.rhs_termlist],
+                                        lambda: iter([data]),
+                                        patsy.EvalEnvironment.capture(0),
+                                        NA_action='drop')
@@ -0,0 +1,221 @@
+"""
+Model Search Module
+Ranks every subset of candidate predictor terms from one shared Gram matrix.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np  # available to formula terms such as np.log1p(x)
+import patsy
+
+
+# Subsets enumerated per task: tasks fix the remaining high-order terms and
+# start again from the base Gram matrix, bounding sweep round-off drift
+SEARCH_BLOCK_BITS = 14
+
+# Relative pivot below which a column is treated as collinear with the model
+SWEEP_TOLERANCE = 1e-9
+
+CRITERIA = {'aic': True, 'bic': True, 'adj_r_squared': False}
+
+
+def search_subsets(df, response, candidates, always_include=(), criterion='bic',
+                   max_terms=None, top=50, n_workers=None):
+    """
+    Fit every subset of candidate terms and rank them by an information criterion.
+    
+    The Gram matrix of [X | y] for the full model is formed once. Subsets are
+    then visited in Gray-code order, so each step adds or removes a single
+    term with sweep-operator updates on its columns instead of refitting.
+    Columns collinear with the rest of the model are left out, as with a
+    pseudo-inverse fit. The 2^p subsets are split into blocks evaluated in
+    parallel processes.
+    
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Data with the response and all candidate variables
+    response : str
+        Response column (e.g. 'pH_reading')
+    candidates : list of str
+        Patsy terms to select among (e.g. ['C(Crop)', 'lime_applied',
+        'years_planted', 'fertilizer_kg_ha']); each may expand to several
+        columns
+    always_include : list of str, optional
+        Terms in every model besides the intercept
+    criterion : str
+        Ranking criterion: 'aic', 'bic' or 'adj_r_squared'
+    max_terms : int, optional
+        Only report subsets with at most this many candidate terms
+    top : int, optional
+        Number of best models to return (None returns all)
+    n_workers : int, optional
+        Worker processes (default os.cpu_count(); 1 searches serially)
+    
+    Returns
+    -------
+    pd.DataFrame
+        Ranked models with formula, terms, n_params, r_squared,
+        adj_r_squared, aic, bic and rank_deficient; n_params is the
+        design rank and statistics match fit_multiple_regression on the
+        same rows. Rows with missing values
+        in any candidate are dropped for all models
+    """
+    if criterion not in CRITERIA:
+        raise ValueError(f"Unknown criterion: {criterion}. Use one of {list(CRITERIA)}")
+    candidates, always_include = list(candidates), list(always_include)
+    if not candidates:
+        raise ValueError("No candidate terms given")
+    
+    formula = f"{response} ~ " + " + ".join(always_include + candidates)
+    y, X = patsy.dmatrices(formula, df, eval_env=0, NA_action='drop', return_type='dataframe')
+    columns = X.design_info.term_name_slices
+    if 'Intercept' not in columns:
+        raise ValueError("Model search requires an intercept")
+    
+    def term_columns(terms):
+        names = [term.name() for term in patsy.ModelDesc.from_formula(terms).rhs_termlist
+                 if term.name() != 'Intercept']
+        return np.concatenate([np.arange(X.shape[1])[columns[name]] for name in names])
+    
+    base = np.concatenate([np.arange(X.shape[1])[columns['Intercept']]]
+                          + [term_columns(term) for term in always_include])
+    term_cols = [term_columns(term) for term in candidates]
+    
+    # Unit-diagonal Gram matrix of [X | y]; RSS is rescaled afterwards.
+    # All-zero columns keep a zero pivot and are reported as rank deficient
+    Z = np.column_stack([X.to_numpy(), y.to_numpy()[:, 0]])
+    gram = Z.T @ Z
+    scale = np.sqrt(np.diag(gram))
+    scale[scale == 0] = 1.0
+    gram /= np.outer(scale, scale)
+    for k in base:
+        if not _sweep(gram, k):
+            raise ValueError("always_include terms are collinear")
+    
+    n_terms = len(candidates)
+    block_bits = min(n_terms, SEARCH_BLOCK_BITS)
+    prefixes = range(2 ** (n_terms - block_bits))
+    n_workers = min(n_workers or os.cpu_count() or 1, len(prefixes))
+    task = (gram, term_cols, block_bits)
+    if n_workers == 1:
+        blocks = [_search_block(task, prefix) for prefix in prefixes]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            blocks = list(pool.map(_search_block, [task] * len(prefixes), prefixes))
+    
+    masks, rss, rank, deficient = (np.concatenate(parts) for parts in zip(*blocks))
+    rss = rss * scale[-1] ** 2
+    n = len(y)
+    y_values = y.to_numpy()[:, 0]
+    tss = np.sum((y_values - y_values.mean()) ** 2)
+    
+    results = pd.DataFrame({
+        'mask': masks,
+        'n_terms': sum((masks >> t) & 1 for t in range(n_terms)),
+        'n_params': rank,
+        'r_squared': 1 - rss / tss,
+        'adj_r_squared': 1 - (n - 1) / (n - rank) * rss / tss,
+        'rank_deficient': deficient
+    })
+    llf = -n / 2 * (np.log(2 * np.pi) + np.log(rss / n) + 1)
+    results['aic'] = -2 * llf + 2 * rank
+    results['bic'] = -2 * llf + np.log(n) * rank
+    
+    if max_terms is not None:
+        results = results[results['n_terms'] <= max_terms]
+    # On ties (e.g. adding an all-zero column) prefer the full-rank model
+    results = results.sort_values([criterion, 'rank_deficient'],
+                                  ascending=[CRITERIA[criterion], True], kind='stable')
+    if top is not None:
+        results = results.head(top)
+    
+    terms = [tuple(c for i, c in enumerate(candidates) if mask >> i & 1) for mask in results['mask']]
+    results.insert(0, 'terms', terms)
+    results.insert(0, 'formula', [f"{response} ~ " + (" + ".join(always_include + list(t)) or "1")
+                                  for t in terms])
+    results['n_obs'] = n
+    
+    return results.drop(columns='mask').reset_index(drop=True)
+
+
+def _sweep(A, k, reverse=False):
+    """
+    Sweep (or reverse-sweep) A in place on pivot k.
+    
+    Returns False and leaves A unchanged when a forward sweep meets a
+    (near-)zero pivot, i.e. column k is collinear with the swept columns.
+    """
+    d = A[k, k]
+    if not reverse and d <= SWEEP_TOLERANCE:
+        return False
+    row = A[k] / d
+    A -= np.outer(A[k], row)
+    A[k] = row if not reverse else -row
+    A[:, k] = A[k]
+    A[k, k] = -1.0 / d
+    return True
+
+
+def _search_block(task, prefix):
+    """
+    Visit the 2^block_bits subsets whose high-order terms are fixed by prefix.
+    
+    Terms are swept column by column. A column collinear with the columns
+    already in the model is deferred rather than swept, so rank and RSS
+    match a pseudo-inverse fit; deferred columns are retried whenever a
+    term leaves the model.
+    
+    Returns (masks, rss, rank, rank_deficient) arrays on the scaled Gram.
+    """
+    gram, term_cols, block_bits = task
+    A = gram.copy()
+    swept = np.diag(A) < 0
+    included = np.zeros(len(term_cols), dtype=bool)
+    deferred = set()
+    
+    def toggle(t):
+        if included[t]:
+            included[t] = False
+            for k in term_cols[t]:
+                if swept[k]:
+                    _sweep(A, k, reverse=True)
+                    swept[k] = False
+                else:
+                    deferred.discard(k)
+            # Columns that were collinear with t's may now enter the model
+            for k in sorted(deferred):
+                if _sweep(A, k):
+                    swept[k] = True
+                    deferred.discard(k)
+        else:
+            included[t] = True
+            for k in term_cols[t]:
+                if _sweep(A, k):
+                    swept[k] = True
+                else:
+                    deferred.add(k)
+    
+    for t in range(block_bits, len(term_cols)):
+        if prefix >> (t - block_bits) & 1:
+            toggle(t)
+    
+    size = 2 ** block_bits
+    masks = np.empty(size, dtype=np.int64)
+    rss = np.empty(size)
+    ranks = np.empty(size, dtype=np.int64)
+    deficient = np.empty(size, dtype=bool)
+    high = prefix << block_bits
+    
+    for i in range(size):
+        if i:
+            # Gray code i ^ (i >> 1) differs from its predecessor in bit ctz(i)
+            toggle((i & -i).bit_length() - 1)
+        masks[i] = high | (i ^ (i >> 1))
+        rss[i] = A[-1, -1]
+        ranks[i] = np.count_nonzero(swept)
+        deficient[i] = bool(deferred)
+    
+    return masks, rss, ranks, deficient
@@ -0,0 +1,143 @@
+"""
+Pipeline Module
+Runs the load → clean → encode → fit workflow with per-stage memory accounting.
+"""
+
+import math
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+from .data_loading import load_data
+from .data_cleaning import handle_missing_values, prepare_regression_data
+from .regression_model import fit_multiple_regression
+
+
+def _rss_high_water_mb():
+    """
+    Process peak resident set size since start-up, in MB.
+    
+    Uses getrusage where available and psutil's peak working set on
+    Windows; returns NaN when neither is available.
+    """
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return math.nan
+        peak = getattr(psutil.Process().memory_info(), 'peak_wset', None)
+        return math.nan if peak is None else peak / 2 ** 20
+    
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+@contextmanager
+def track_memory(stage, records):
+    """
+    Record the peak traced allocation and RSS high-water mark of a stage.
+    
+    The RSS high-water mark is process-wide and never decreases:
+    'process_rss_peak_mb' is its value after the stage, and
+    'rss_peak_growth_mb' is how far the stage raised it (zero when the
+    stage stayed below an earlier peak). Per-stage allocation peaks are
+    given by the tracemalloc columns.
+    
+    Parameters
+    ----------
+    stage : str
+        Stage name
+    records : list
+        List the stage's record dict is appended to
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    rss_before = _rss_high_water_mb()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        rss_after = _rss_high_water_mb()
+        if started:
+            tracemalloc.stop()
+        records.append({
+            'stage': stage,
+            'seconds': time.perf_counter() - start,
+            'peak_mb': (peak - baseline) / 2 ** 20,
+            'retained_mb': (current - baseline) / 2 ** 20,
+            'process_rss_peak_mb': rss_after,
+            'rss_peak_growth_mb': rss_after - rss_before
+        })
+
+
+@contextmanager
+def _copy_on_write():
+    """Enable pandas copy-on-write where it is still opt-in (pandas < 3)."""
+    if int(pd.__version__.split('.')[0]) < 3:
+        with pd.option_context('mode.copy_on_write', True):
+            yield
+    else:
+        yield
+
+
+def run_pipeline(data, formula, strategy='documented', encode=True, copy=False):
+    """
+    Run load → clean → encode → fit, reporting memory for each stage.
+    
+    With copy=False (the default) the cleaning and encoding stages share
+    unchanged columns with their input instead of copying the whole frame,
+    and pandas copy-on-write keeps the input unmodified.
+    
+    Parameters
+    ----------
+    data : str, Path or pd.DataFrame
+        Data file path or already loaded dataset
+    formula : str
+        Patsy formula for the regression
+    strategy : str or dict
+        Missing-value strategy passed to handle_missing_values
+    encode : bool
+        Add Crop/Barangay dummy columns with prepare_regression_data
+    copy : bool
+        Use the original copying behaviour of each stage
+    
+    Returns
+    -------
+    dict
+        'data' (model frame), 'cleaning' documentation, 'model' and
+        'memory' (per-stage DataFrame of seconds, traced peak and retained
+        MB, the process RSS high-water mark after the stage and how far
+        the stage raised it)
+    """
+    records = []
+    with _copy_on_write():
+        with track_memory('load', records):
+            df = load_data(data) if isinstance(data, (str, Path)) else data
+        
+        with track_memory('clean', records):
+            df_clean, documentation = handle_missing_values(df, strategy=strategy, copy=copy)
+        
+        if encode:
+            with track_memory('encode', records):
+                df_clean = prepare_regression_data(df_clean, copy=copy)
+        
+        with track_memory('fit', records):
+            model = fit_multiple_regression(df_clean, formula)
+    
+    return {
+        'data': df_clean,
+        'cleaning': documentation,
+        'model': model,
+        'memory': pd.DataFrame(records).set_index('stage')
+    }
@@ -3,38 +3,278 @@ Regression Model Module
 Fits multiple linear regression with statsmodels for publication-quality output.
 """
 
+import itertools
+import re
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
+import patsy
 import statsmodels.api as sm
+from scipy import stats
 from statsmodels.formula.api import ols
 
+from .data_loading import iter_data_chunks
+from .streaming import MomentAccumulator
+
 
-def fit_multiple_regression(df, formula, method='ols'):
+def fit_multiple_regression(df, formula, method='ols', chunksize=50000, design_cache=None):
     """
     Fit multiple linear regression model using statsmodels.
     
     Parameters
     ----------
-    df : pd.DataFrame
-        Data with all variables
+    df : pd.DataFrame, str/Path or callable
+        Data with all variables. method='chunked' also accepts a data file
+        path or a callable returning a fresh iterator of DataFrame chunks
     formula : str
         Patsy formula for regression (e.g., 'pH_reading ~ rainfall + fertilizer')
     method : str
-        Fitting method: 'ols' (ordinary least squares)
+        Fitting method: 'ols' (ordinary least squares) or 'chunked'
+        (out-of-core OLS, see fit_chunked_regression)
+    chunksize : int
+        Rows per chunk for method='chunked'
+    design_cache : DesignCache, optional
+        Cache of encoded terms for method='ols'; formulas sharing terms on
+        the same data reuse the cached design columns
     
     Returns
     -------
-    statsmodels.regression.linear_model.RegressionResults
+    statsmodels.regression.linear_model.RegressionResults or ChunkedOLSResults
         Fitted model object with full statistical output
     """
-    if method == 'ols':
+    if isinstance(df, pd.DataFrame):
+        df = _densify_referenced(df, formula)
+    
+    if method == 'ols' and design_cache is not None:
+        y, X, design_info = design_cache.design(df, formula)
+        ols_model = sm.OLS(y, X)
+        # Formula metadata lets predict/get_prediction encode raw new data;
+        # statsmodels 0.15 reads data.model_spec, 0.14 data.design_info
+        ols_model.formula = ols_model.data.formula = formula
+        ols_model.data.model_spec = ols_model.data.design_info = design_info
+        model = ols_model.fit()
+    elif method == 'ols':
         model = ols(formula, data=df).fit()
+    elif method == 'chunked':
+        model = fit_chunked_regression(df, formula, chunksize=chunksize)
     else:
         raise ValueError(f"Unknown method: {method}")
     
     return model
 
 
+def _densify_referenced(df, formula):
+    """
+    Densify the pandas sparse columns a formula refers to.
+    
+    Patsy cannot evaluate sparse columns such as the dummies from
+    prepare_regression_data(sparse=True). Columns are matched as bare
+    names or quoted names (Q("Barangay_New Visayas")); sparse columns the
+    formula does not use stay sparse.
+    """
+    sparse = [col for col, dtype in df.dtypes.items() if isinstance(dtype, pd.SparseDtype)]
+    if not sparse:
+        return df
+    names = _formula_names(formula)
+    referenced = [col for col in sparse if col in names]
+    if not referenced:
+        return df
+    return df.assign(**{col: df[col].sparse.to_dense() for col in referenced})
+
+
+def _formula_names(formula):
+    """Bare and quoted (Q("...")) names a formula may refer to."""
+    names = set(re.findall(r'[A-Za-z_]\w*', formula))
+    names.update(match[1] for match in re.findall(r'(["\'])(.*?)\1', formula))
+    return names
+
+
+def fit_chunked_regression(source, formula, chunksize=50000):
+    """
+    Fit OLS out of core by streaming chunks through an incremental QR.
+    
+    A first pass collects categorical levels across all chunks (patsy then
+    only needs to see chunks again for stateful transforms such as
+    center()); a final pass folds each chunk's [X | y] rows into a running
+    (k+1)×(k+1) triangular factor. Memory depends on chunksize and
+    the number of model terms, not on the number of rows.
+    
+    Parameters
+    ----------
+    source : pd.DataFrame, str/Path or callable
+        In-memory data, a CSV/Excel path read with iter_data_chunks, or a
+        callable returning a fresh iterator of DataFrame chunks (called
+        once per pass)
+    formula : str
+        Patsy formula for regression
+    chunksize : int
+        Rows per chunk for DataFrame and file sources
+    
+    Returns
+    -------
+    ChunkedOLSResults
+        Results usable with extract_regression_summary,
+        create_regression_table and make_prediction
+    """
+    make_chunks = _chunk_source(source, chunksize, formula)
+    y_info, x_info = patsy.incr_dbuilders(formula, make_chunks, NA_action='drop')
+    
+    k = len(x_info.column_names)
+    R = np.zeros((0, k + 1))
+    y_moments = MomentAccumulator()
+    for chunk in make_chunks():
+        y, X = patsy.build_design_matrices([y_info, x_info], chunk, NA_action='drop')
+        y = np.asarray(y, dtype=np.float64)[:, 0]
+        y_moments.update(y)
+        R = np.linalg.qr(np.vstack([R, np.column_stack([X, y])]), mode='r')
+    
+    if y_moments.n <= k:
+        raise ValueError(f"Need more than {k} complete rows to fit {formula!r}, got {y_moments.n}")
+    
+    return ChunkedOLSResults(R, y_moments, x_info, formula)
+
+
+def _chunk_source(source, chunksize, formula):
+    """
+    Normalize a data source into a callable returning a chunk iterator.
+    
+    Text and categorical columns the formula uses are recast to one
+    categorical dtype holding the levels seen across all chunks. Chunk-level
+    categories otherwise differ between chunks, and patsy's per-element
+    handling of plain string columns dominates the fit time on large
+    archives. Columns the formula does not use (e.g. a per-row Site_Id) are
+    left alone, so the level sets stay bounded by the model's factors.
+    """
+    if callable(source):
+        make_chunks = source
+    elif isinstance(source, (str, Path)):
+        make_chunks = lambda: iter_data_chunks(source, chunksize=chunksize)
+    elif isinstance(source, pd.DataFrame):
+        make_chunks = lambda: (source.iloc[start:start + chunksize]
+                               for start in range(0, len(source), chunksize))
+    else:
+        raise TypeError(f"Unsupported data source: {type(source).__name__}")
+    
+    names = _formula_names(formula)
+    levels = {}
+    for chunk in make_chunks():
+        text = chunk.select_dtypes(include=['category', 'object', 'string']).columns
+        for col in text.intersection(list(names)):
+            levels.setdefault(col, set()).update(chunk[col].dropna().unique())
+    dtypes = {col: pd.CategoricalDtype(sorted(values)) for col, values in levels.items()}
+    
+    def with_shared_levels():
+        for chunk in make_chunks():
+            yield chunk.astype({col: dtype for col, dtype in dtypes.items() if col in chunk})
+    
+    return with_shared_levels
+
+
+class ChunkedOLSResults:
+    """
+    OLS results rebuilt from the triangular factor of [X | y].
+    
+    Exposes the subset of statsmodels' RegressionResults used by this
+    package (params, bse, tvalues, pvalues, conf_int, fit statistics and
+    get_prediction). Residual-based diagnostics need a second pass over the
+    data and are not available.
+    """
+    
+    def __init__(self, R, y_moments, design_info, formula):
+        k = len(design_info.column_names)
+        names = design_info.column_names
+        self.design_info = design_info
+        self.formula = formula
+        self.exog_names = names
+        
+        R_x, qty = R[:k, :k], R[:k, k]
+        R_x_pinv = np.linalg.pinv(R_x)
+        self.normalized_cov_params = R_x_pinv @ R_x_pinv.T
+        self.rank = np.linalg.matrix_rank(R_x)
+        self.k_constant = int('Intercept' in names)
+        
+        self.nobs = float(y_moments.n)
+        # With a rank-deficient R_x part of qty lies outside its range and
+        # belongs to the residual along with R[k, k]
+        fitted_gap = R_x @ (R_x_pinv @ qty) - qty
+        self.ssr = float(fitted_gap @ fitted_gap + (R[k, k] ** 2 if R.shape[0] > k else 0.0))
+        self.centered_tss = float(y_moments.m2)
+        self.uncentered_tss = float(y_moments.m2 + y_moments.n * y_moments.mean ** 2)
+        tss = self.centered_tss if self.k_constant else self.uncentered_tss
+        self.ess = tss - self.ssr
+        
+        self.df_model = float(self.rank - self.k_constant)
+        self.df_resid = self.nobs - self.rank
+        self.scale = self.ssr / self.df_resid
+        self.mse_resid = self.scale
+        
+        self.params = pd.Series(R_x_pinv @ qty, index=names)
+        self.bse = pd.Series(np.sqrt(np.diag(self.normalized_cov_params) * self.scale), index=names)
+        self.tvalues = self.params / self.bse
+        self.pvalues = pd.Series(2 * stats.t.sf(np.abs(self.tvalues), self.df_resid), index=names)
+        
+        self.rsquared = 1 - self.ssr / tss
+        self.rsquared_adj = 1 - (self.nobs - self.k_constant) / self.df_resid * (1 - self.rsquared)
+        self.fvalue = (self.ess / self.df_model) / self.scale if self.df_model > 0 else np.nan
+        self.f_pvalue = stats.f.sf(self.fvalue, self.df_model, self.df_resid)
+        
+        self.llf = -self.nobs / 2 * (np.log(2 * np.pi) + np.log(self.ssr / self.nobs) + 1)
+        n_params = self.df_model + self.k_constant
+        self.aic = -2 * self.llf + 2 * n_params
+        self.bic = -2 * self.llf + np.log(self.nobs) * n_params
+    
+    def cov_params(self):
+        """Covariance matrix of the coefficient estimates."""
+        return pd.DataFrame(self.normalized_cov_params * self.scale,
+                            index=self.exog_names, columns=self.exog_names)
+    
+    def conf_int(self, alpha=0.05):
+        """Confidence intervals for the coefficients (columns 0 and 1)."""
+        margin = stats.t.ppf(1 - alpha / 2, self.df_resid) * self.bse
+        return pd.DataFrame({0: self.params - margin, 1: self.params + margin})
+    
+    def _design(self, new_data):
+        (X,) = patsy.build_design_matrices([self.design_info], new_data,
+                                           NA_action='drop', return_type='dataframe')
+        return X
+    
+    def predict(self, new_data):
+        """Predicted means for new data."""
+        X = self._design(new_data)
+        return pd.Series(X.to_numpy() @ self.params.to_numpy(), index=X.index)
+    
+    def get_prediction(self, new_data):
+        """Predictions with standard errors, as RegressionResults.get_prediction."""
+        X = self._design(new_data)
+        values = X.to_numpy()
+        mean = values @ self.params.to_numpy()
+        var_mean = np.einsum('ij,jk,ik->i', values, self.normalized_cov_params, values) * self.scale
+        return _ChunkedPrediction(mean, var_mean, self.scale, self.df_resid, X.index)
+
+
+class _ChunkedPrediction:
+    """Prediction results exposing summary_frame like statsmodels."""
+    
+    def __init__(self, mean, var_mean, scale, df_resid, index):
+        self.predicted_mean = mean
+        self.se_mean = np.sqrt(var_mean)
+        self.se_obs = np.sqrt(var_mean + scale)
+        self.df_resid = df_resid
+        self.index = index
+    
+    def summary_frame(self, alpha=0.05):
+        q = stats.t.ppf(1 - alpha / 2, self.df_resid)
+        return pd.DataFrame({
+            'mean': self.predicted_mean,
+            'mean_se': self.se_mean,
+            'mean_ci_lower': self.predicted_mean - q * self.se_mean,
+            'mean_ci_upper': self.predicted_mean + q * self.se_mean,
+            'obs_ci_lower': self.predicted_mean - q * self.se_obs,
+            'obs_ci_upper': self.predicted_mean + q * self.se_obs
+        }, index=self.index)
+
+
 def extract_regression_summary(model):
     """
     Extract key statistics from fitted regression model.
@@ -193,7 +433,7 @@ def generate_model_report(model):
     return "\n".join(report)
 
 
-def make_prediction(model, new_data, confidence=0.95):
+def make_prediction(model, new_data, confidence=0.95, encoder=None, chunksize=None):
     """
     Make predictions with confidence intervals on new data.
     
@@ -205,14 +445,30 @@ def make_prediction(model, new_data, confidence=0.95):
         New data for prediction
     confidence : float
         Confidence level (default 0.95 for 95% CI)
+    encoder : CategoricalEncoder, optional
+        Encoder used to build the model's dummy columns; new_data is
+        encoded with the same levels before predicting
+    chunksize : int, optional
+        Score through BatchPredictor in chunks of this many rows instead of
+        statsmodels' get_prediction; rows that cannot be scored (missing
+        values, unseen levels) get NaN rather than being dropped
     
     Returns
     -------
     dict
         Predictions with confidence intervals
     """
-    predictions = model.get_prediction(new_data)
-    pred_summary = predictions.summary_frame(alpha=1-confidence)
+    if encoder is not None:
+        new_data = pd.concat([new_data, encoder.transform_frame(new_data)], axis=1)
+    
+    if chunksize is not None:
+        pred_summary = BatchPredictor(model).predict(new_data, confidence=confidence, chunksize=chunksize)
+    else:
+        formula = getattr(getattr(model, 'model', model), 'formula', None)
+        if formula is not None:
+            new_data = _densify_referenced(new_data, formula)
+        predictions = model.get_prediction(new_data)
+        pred_summary = predictions.summary_frame(alpha=1-confidence)
     
     return {
         'predicted_mean': pred_summary['mean'],
@@ -223,3 +479,342 @@ def make_prediction(model, new_data, confidence=0.95):
         'obs_ci_upper': pred_summary['obs_ci_upper'],
         'table': pred_summary
     }
+
+
+class BatchPredictor:
+    """
+    Fast, memory-bounded scoring for a fitted formula model.
+    
+    The coefficient vector and a Cholesky factor L of the parameter
+    covariance (LL' = cov_params) are extracted once. New rows are encoded
+    directly from the model's patsy DesignInfo, categorical factors via
+    vectorized level codes, and scored chunk by chunk into one preallocated
+    output array: the mean is Xβ, and the mean standard error is the row norm
+    of XL.
+    
+    Parameters
+    ----------
+    model : RegressionResults or ChunkedOLSResults
+        Fitted model built from a formula
+    """
+    
+    def __init__(self, model):
+        design_info = getattr(model, 'design_info', None)
+        if design_info is None:
+            design_info = getattr(getattr(model, 'model', None), 'data', None)
+            design_info = getattr(design_info, 'model_spec', None) or getattr(design_info, 'design_info', None)
+        if design_info is None:
+            raise ValueError("BatchPredictor needs a model fitted from a formula")
+        self.design_info = design_info
+        
+        self.params = np.asarray(model.params, dtype=np.float64)
+        cov = np.asarray(model.cov_params(), dtype=np.float64)
+        try:
+            self.cov_factor = np.linalg.cholesky(cov)
+        except np.linalg.LinAlgError:
+            # Rank-deficient fits have a semidefinite covariance
+            w, V = np.linalg.eigh(cov)
+            self.cov_factor = V * np.sqrt(np.clip(w, 0, None))
+        self.scale = float(model.scale)
+        self.df_resid = float(model.df_resid)
+    
+    def design(self, data):
+        """
+        Design matrix rows for data and a mask of rows that could be encoded.
+        
+        Columns follow the DesignInfo layout (terms, subterms, then factor
+        column combinations with the left-most factor varying fastest).
+        """
+        n = len(data)
+        values = {}
+        valid = np.ones(n, dtype=bool)
+        for factor, info in self.design_info.factor_infos.items():
+            value = factor.eval(info.state, data)
+            if info.type == 'categorical':
+                # C(...) returns a box around the raw values
+                value = value.data if hasattr(value, 'contrast') else value
+                if not isinstance(value, (pd.Series, pd.Categorical)):
+                    value = np.asarray(value)
+                codes = pd.Categorical(value, categories=list(info.categories)).codes
+                valid &= codes >= 0
+                values[factor] = np.where(codes >= 0, codes, 0)
+            else:
+                value = np.asarray(value, dtype=np.float64).reshape(n, -1)
+                valid &= ~np.isnan(value).any(axis=1)
+                values[factor] = value
+        
+        X = np.ones((n, len(self.design_info.column_names)))
+        col = 0
+        for term in self.design_info.terms:
+            for subterm in self.design_info.term_codings[term]:
+                widths = [subterm.contrast_matrices[f].matrix.shape[1] if f in subterm.contrast_matrices
+                          else self.design_info.factor_infos[f].num_columns for f in subterm.factors]
+                for combo in itertools.product(*[range(w) for w in reversed(widths)]):
+                    for factor, idx in zip(subterm.factors, combo[::-1]):
+                        if factor in subterm.contrast_matrices:
+                            X[:, col] *= subterm.contrast_matrices[factor].matrix[values[factor], idx]
+                        else:
+                            X[:, col] *= values[factor][:, idx]
+                    col += 1
+        return X, valid
+    
+    def predict(self, new_data, confidence=0.95, chunksize=100_000):
+        """
+        Predicted means with confidence and prediction intervals.
+        
+        Returns
+        -------
+        pd.DataFrame
+            Columns as statsmodels' summary_frame, indexed like new_data
+        """
+        n = len(new_data)
+        out = np.full((n, 6), np.nan)
+        q = stats.t.ppf(1 - (1 - confidence) / 2, self.df_resid)
+        
+        for start in range(0, n, chunksize):
+            stop = min(start + chunksize, n)
+            X, valid = self.design(new_data.iloc[start:stop])
+            mean = X @ self.params
+            XL = X @ self.cov_factor
+            se_mean = np.sqrt(np.einsum('ij,ij->i', XL, XL))
+            se_obs = np.sqrt(se_mean ** 2 + self.scale)
+            
+            block = out[start:stop]
+            block[:, 0] = mean
+            block[:, 1] = se_mean
+            block[:, 2] = mean - q * se_mean
+            block[:, 3] = mean + q * se_mean
+            block[:, 4] = mean - q * se_obs
+            block[:, 5] = mean + q * se_obs
+            block[~valid] = np.nan
+        
+        return pd.DataFrame(out, index=new_data.index, copy=False,
+                            columns=['mean', 'mean_se', 'mean_ci_lower', 'mean_ci_upper',
+                                     'obs_ci_lower', 'obs_ci_upper'])
+
+
+def fit_grouped_regressions(df, formula, groupby=('Barangay', 'Crop'), decimals=4):
+    """
+    Fit the same OLS model separately within every group in one batched pass.
+    
+    The design matrix is built once, rows are sorted by group, and each
+    group's X'X and X'y are formed with segment reductions. All groups are
+    then solved together with a stacked pseudo-inverse, so rank-deficient
+    groups get the same minimum-norm estimates as statsmodels.
+    
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Data with the model variables and group columns
+    formula : str
+        Patsy formula fitted within each group (e.g.
+        'pH_reading ~ fertilizer_kg_ha + years_planted')
+    groupby : str or list
+        Group columns (default one model per Barangay×Crop cell)
+    decimals : int
+        Decimal places for rounding, as in create_regression_table
+    
+    Returns
+    -------
+    pd.DataFrame
+        Tidy table with one row per group and term: the group columns,
+        'term', the create_regression_table columns, 'n_obs' and
+        'dof_resid'. Groups without residual degrees of freedom get NaN
+        standard errors
+    """
+    keys = [groupby] if isinstance(groupby, str) else list(groupby)
+    data = df.reset_index(drop=True)
+    y, X = patsy.dmatrices(formula, data, eval_env=0, NA_action='drop', return_type='dataframe')
+    
+    codes = data.loc[X.index, keys].groupby(keys, observed=True, sort=True).ngroup()
+    has_group = codes.notna().to_numpy()
+    codes = codes.to_numpy()[has_group].astype(np.int64)
+    order = np.argsort(codes, kind='stable')
+    codes = codes[order]
+    X_sorted = X.to_numpy()[has_group][order]
+    y_sorted = y.to_numpy()[has_group, 0][order]
+    starts = np.flatnonzero(np.r_[True, np.diff(codes) != 0])
+    n_obs = np.diff(np.r_[starts, len(codes)])
+    
+    # Per-group X'X and X'y from one pass per column pair
+    k = X.shape[1]
+    xtx = np.empty((len(starts), k, k))
+    for i in range(k):
+        for j in range(i, k):
+            xtx[:, i, j] = xtx[:, j, i] = np.add.reduceat(X_sorted[:, i] * X_sorted[:, j], starts)
+    xty = np.add.reduceat(X_sorted * y_sorted[:, np.newaxis], starts, axis=0)
+    
+    normalized_cov = np.linalg.pinv(xtx, hermitian=True)
+    rank = np.linalg.matrix_rank(xtx, hermitian=True)
+    params = np.einsum('gij,gj->gi', normalized_cov, xty)
+    
+    resid = y_sorted - np.einsum('ij,ij->i', X_sorted, params[codes])
+    rss = np.add.reduceat(resid ** 2, starts)
+    dof_resid = n_obs - rank
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = np.where(dof_resid > 0, rss / dof_resid, np.nan)
+        bse = np.sqrt(np.diagonal(normalized_cov, axis1=1, axis2=2) * scale[:, np.newaxis])
+        tvalues = params / bse
+    dof = np.where(dof_resid > 0, dof_resid, np.nan)[:, np.newaxis]
+    pvalues = 2 * stats.t.sf(np.abs(tvalues), dof)
+    margin = stats.t.ppf(0.975, dof) * bse
+    
+    group_rows = data.loc[X.index[has_group][order[starts]], keys].reset_index(drop=True)
+    table = group_rows.loc[np.repeat(np.arange(len(starts)), k)].reset_index(drop=True)
+    table['term'] = np.tile(X.columns.to_numpy(), len(starts))
+    table['Coefficient'] = params.ravel().round(decimals)
+    table['Std. Error'] = bse.ravel().round(decimals)
+    table['t-statistic'] = tvalues.ravel().round(4)
+    table['p-value'] = pvalues.ravel().round(4)
+    table['95% CI Lower'] = (params - margin).ravel().round(decimals)
+    table['95% CI Upper'] = (params + margin).ravel().round(decimals)
+    table['n_obs'] = np.repeat(n_obs, k)
+    table['dof_resid'] = np.repeat(dof_resid, k)
+    
+    return table
+
+
+class RecursiveOLS:
+    """
+    OLS model updated in place as readings arrive or are retracted.
+    
+    The inverse Gram matrix P = (X'X)^-1 is kept current with Woodbury
+    rank-k updates per batch (downdates for retracted rows), alongside X'X,
+    X'y and y'y. Coefficients, standard errors and R² are available after
+    every batch at O(k²·m) cost for a batch of m rows, with no refit. P is
+    recomputed from X'X every refresh_every batches to stop round-off drift.
+    
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Initial data; fixes the formula's categorical levels and must give
+        a full-rank design
+    formula : str
+        Patsy formula for regression
+    refresh_every : int
+        Batches between exact re-inversions of X'X
+    
+    Examples
+    --------
+    >>> model = RecursiveOLS(history, 'pH_reading ~ fertilizer_kg_ha + C(Crop)')
+    >>> model.update(new_readings)
+    >>> model.retract(bad_readings)
+    >>> create_regression_table(model.results())
+    """
+    
+    def __init__(self, df, formula, refresh_every=100):
+        self.formula = formula
+        self.refresh_every = refresh_every
+        y, X = patsy.dmatrices(formula, df, eval_env=0, NA_action='drop')
+        self._y_info, self.design_info = y.design_info, X.design_info
+        self.exog_names = X.design_info.column_names
+        
+        X, y = np.asarray(X), np.asarray(y)[:, 0]
+        self.nobs = len(y)
+        self.xtx = X.T @ X
+        self.xty = X.T @ y
+        self.yty = y @ y
+        self.sum_y = y.sum()
+        if np.linalg.matrix_rank(self.xtx) < len(self.exog_names):
+            raise ValueError("Initial data must give a full-rank design")
+        self._refresh()
+    
+    def _refresh(self):
+        self.inv_gram = np.linalg.inv(self.xtx)
+        self._batches = 0
+    
+    def _batch(self, new_data):
+        if isinstance(new_data, tuple):
+            # Pre-encoded (X, y) arrays skip patsy, which dominates per-reading cost
+            X, y = new_data
+            return np.atleast_2d(np.asarray(X, dtype=np.float64)), np.atleast_1d(np.asarray(y, dtype=np.float64))
+        y, X = patsy.build_design_matrices([self._y_info, self.design_info], new_data,
+                                           NA_action='drop')
+        return np.asarray(X), np.asarray(y)[:, 0]
+    
+    def update(self, new_data):
+        """
+        Add a batch of observations; returns self.
+        
+        new_data is a DataFrame, or an (X, y) tuple already encoded with
+        design_info.
+        """
+        X, y = self._batch(new_data)
+        return self._apply(X, y, 1.0)
+    
+    def retract(self, old_data):
+        """Remove previously added observations (e.g. bad readings); returns self."""
+        X, y = self._batch(old_data)
+        if self.nobs - len(y) <= len(self.exog_names):
+            raise ValueError("Retraction would leave too few observations to fit the model")
+        return self._apply(X, y, -1.0)
+    
+    def _apply(self, X, y, sign):
+        if len(y) == 0:
+            return self
+        # Woodbury: (A ± X'X)^-1 = P ∓ P X' (I ± X P X')^-1 X P
+        PXt = self.inv_gram @ X.T
+        S = np.eye(len(y)) + sign * (X @ PXt)
+        try:
+            gain = np.linalg.solve(S, PXt.T)
+        except np.linalg.LinAlgError:
+            raise ValueError("Batch makes the design singular") from None
+        self.inv_gram = self.inv_gram - sign * (PXt @ gain)
+        
+        self.xtx += sign * (X.T @ X)
+        self.xty += sign * (X.T @ y)
+        self.yty += sign * (y @ y)
+        self.sum_y += sign * y.sum()
+        self.nobs += int(sign) * len(y)
+        
+        self._batches += 1
+        if self._batches >= self.refresh_every or np.any(np.diag(self.inv_gram) <= 0):
+            self._refresh()
+        return self
+    
+    @property
+    def params(self):
+        return pd.Series(self.inv_gram @ self.xty, index=self.exog_names)
+    
+    @property
+    def df_resid(self):
+        return self.nobs - len(self.exog_names)
+    
+    @property
+    def ssr(self):
+        return max(self.yty - self.params.to_numpy() @ self.xty, 0.0)
+    
+    @property
+    def scale(self):
+        return self.ssr / self.df_resid
+    
+    @property
+    def bse(self):
+        return pd.Series(np.sqrt(np.diag(self.inv_gram) * self.scale), index=self.exog_names)
+    
+    @property
+    def rsquared(self):
+        centered_tss = self.yty - self.sum_y ** 2 / self.nobs
+        return 1 - self.ssr / centered_tss
+    
+    def results(self):
+        """
+        Snapshot as ChunkedOLSResults for extract_regression_summary,
+        create_regression_table and make_prediction.
+        """
+        k = len(self.exog_names)
+        gram = np.empty((k + 1, k + 1))
+        gram[:k, :k] = self.xtx
+        gram[:k, k] = gram[k, :k] = self.xty
+        gram[k, k] = self.yty
+        # Triangular factor with R'R = [X | y]'[X | y]; an exact fit makes
+        # the Gram singular, so fall back to a QR of its eigen square root
+        try:
+            R = np.linalg.cholesky(gram).T
+        except np.linalg.LinAlgError:
+            w, V = np.linalg.eigh(gram)
+            R = np.linalg.qr(np.sqrt(np.clip(w, 0, None))[:, np.newaxis] * V.T, mode='r')
+        
+        mean = self.sum_y / self.nobs
+        y_moments = MomentAccumulator()._combine(self.nobs, mean, self.yty - self.nobs * mean ** 2, 0.0, 0.0)
+        return ChunkedOLSResults(R, y_moments, self.design_info, self.formula)
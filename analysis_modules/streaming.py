@@ -0,0 +1,624 @@
+"""
+Streaming Statistics Module
+Mergeable single-pass accumulators for summarizing chunked or sharded data.
+"""
+
+import pandas as pd
+import numpy as np
+from scipy import stats
+
+
+def _merge_moments(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+    """Combine two (count, mean, M2) triples with Chan's parallel update."""
+    n = n_a + n_b
+    if n == 0:
+        return 0, 0.0, 0.0
+    delta = mean_b - mean_a
+    mean = mean_a + delta * n_b / n
+    m2 = m2_a + m2_b + delta ** 2 * n_a * n_b / n
+    return n, mean, m2
+
+
+class MomentAccumulator:
+    """
+    Mergeable running moments (count, mean, M2, M3, M4) of a numeric stream.
+    
+    Chunks are reduced with vectorized NumPy and combined with Pébay's
+    pairwise update formulas, so skewness and kurtosis of very large or
+    sharded vectors cost one pass and constant memory.
+    """
+    
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+    
+    def update(self, values):
+        """Add values (NaNs are ignored); returns self."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        mean = values.mean()
+        dev = values - mean
+        dev2 = dev * dev
+        return self._combine(len(values), mean, dev2.sum(), (dev2 * dev).sum(), (dev2 * dev2).sum())
+    
+    def merge(self, other):
+        """Fold another accumulator into this one; returns self."""
+        return self._combine(other.n, other.mean, other.m2, other.m3, other.m4)
+    
+    def _combine(self, n_b, mean_b, m2_b, m3_b, m4_b):
+        n_a = self.n
+        n = n_a + n_b
+        if n_b == 0:
+            return self
+        delta = mean_b - self.mean
+        m2_a, m3_a = self.m2, self.m3
+        
+        self.m4 = (self.m4 + m4_b
+                   + delta ** 4 * n_a * n_b * (n_a ** 2 - n_a * n_b + n_b ** 2) / n ** 3
+                   + 6 * delta ** 2 * (n_a ** 2 * m2_b + n_b ** 2 * m2_a) / n ** 2
+                   + 4 * delta * (n_a * m3_b - n_b * m3_a) / n)
+        self.m3 = (m3_a + m3_b
+                   + delta ** 3 * n_a * n_b * (n_a - n_b) / n ** 2
+                   + 3 * delta * (n_a * m2_b - n_b * m2_a) / n)
+        self.m2 = m2_a + m2_b + delta ** 2 * n_a * n_b / n
+        self.mean = self.mean + delta * n_b / n
+        self.n = n
+        return self
+    
+    @property
+    def variance(self):
+        """Sample variance (ddof=1)."""
+        return self.m2 / (self.n - 1) if self.n > 1 else np.nan
+    
+    @property
+    def skewness(self):
+        """Biased sample skewness g1 (as scipy.stats.skew)."""
+        return np.sqrt(self.n) * self.m3 / self.m2 ** 1.5 if self.m2 > 0 else np.nan
+    
+    @property
+    def kurtosis(self):
+        """Biased Pearson kurtosis b2 (normal = 3)."""
+        return self.n * self.m4 / self.m2 ** 2 if self.m2 > 0 else np.nan
+
+
+class SummaryAccumulator:
+    """
+    Single-pass dataset summary built from Welford/Chan moment updates.
+    
+    Feed chunks with update(); accumulators built on different partitions
+    can be combined with merge(). Memory is O(columns) plus the distinct
+    values of non-numeric columns.
+    
+    Examples
+    --------
+    >>> acc = SummaryAccumulator()
+    >>> for chunk in load_data('readings.csv', chunksize=100_000):
+    ...     acc.update(chunk)
+    >>> summary = acc.result()
+    """
+    
+    def __init__(self):
+        self.n_rows = 0
+        self.dtypes = {}
+        self.null_counts = {}
+        self.moments = {}
+        self.categories = {}
+    
+    def update(self, chunk):
+        """
+        Add a DataFrame chunk to the summary.
+        
+        Parameters
+        ----------
+        chunk : pd.DataFrame
+            Rows to accumulate
+        
+        Returns
+        -------
+        SummaryAccumulator
+            self, to allow chaining
+        """
+        self.n_rows += len(chunk)
+        for col, dtype in chunk.dtypes.items():
+            self.dtypes.setdefault(col, dtype)
+        
+        nulls = chunk.isna().sum()
+        for col, count in nulls.items():
+            self.null_counts[col] = self.null_counts.get(col, 0) + int(count)
+        
+        numeric_cols = [col for col, dtype in chunk.dtypes.items()
+                        if pd.api.types.is_numeric_dtype(dtype)
+                        and not isinstance(dtype, pd.CategoricalDtype)]
+        if numeric_cols and len(chunk):
+            values = chunk[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = ~np.isnan(values)
+            counts = valid.sum(axis=0)
+            sums = np.where(valid, values, 0.0).sum(axis=0)
+            means = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+            m2s = np.where(valid, (values - means) ** 2, 0.0).sum(axis=0)
+            mins = np.where(valid, values, np.inf).min(axis=0)
+            maxs = np.where(valid, values, -np.inf).max(axis=0)
+            for i, col in enumerate(numeric_cols):
+                self._add_moments(col, int(counts[i]), means[i], m2s[i], mins[i], maxs[i])
+        
+        for col in chunk.columns.difference(numeric_cols, sort=False):
+            self.categories.setdefault(col, set()).update(chunk[col].dropna().unique())
+        
+        return self
+    
+    def merge(self, other):
+        """
+        Fold another accumulator (e.g. from a different partition) into this one.
+        
+        Parameters
+        ----------
+        other : SummaryAccumulator
+            Accumulator to merge
+        
+        Returns
+        -------
+        SummaryAccumulator
+            self, to allow chaining
+        """
+        self.n_rows += other.n_rows
+        for col, dtype in other.dtypes.items():
+            self.dtypes.setdefault(col, dtype)
+        for col, count in other.null_counts.items():
+            self.null_counts[col] = self.null_counts.get(col, 0) + count
+        for col, (n, mean, m2, lo, hi) in other.moments.items():
+            self._add_moments(col, n, mean, m2, lo, hi)
+        for col, values in other.categories.items():
+            self.categories.setdefault(col, set()).update(values)
+        
+        return self
+    
+    def _add_moments(self, col, n, mean, m2, lo, hi):
+        """Combine one column's chunk moments into the running totals."""
+        n_a, mean_a, m2_a, lo_a, hi_a = self.moments.get(col, (0, 0.0, 0.0, np.inf, -np.inf))
+        n, mean, m2 = _merge_moments(n_a, mean_a, m2_a, n, mean, m2)
+        self.moments[col] = (n, mean, m2, min(lo_a, lo), max(hi_a, hi))
+    
+    def result(self):
+        """
+        Summary in the get_data_summary format.
+        
+        Returns
+        -------
+        dict
+            Row/column counts, dtypes, missing counts and percentages,
+            numeric moments and categorical cardinalities
+        """
+        missing_pct = {col: (count / self.n_rows * 100 if self.n_rows else np.nan)
+                       for col, count in self.null_counts.items()}
+        
+        numeric = {}
+        for col, (n, mean, m2, lo, hi) in self.moments.items():
+            numeric[col] = {
+                'count': n,
+                'mean': float(mean) if n else np.nan,
+                'std': float(np.sqrt(m2 / (n - 1))) if n > 1 else np.nan,
+                'min': float(lo) if n else np.nan,
+                'max': float(hi) if n else np.nan
+            }
+        
+        return {
+            'n_observations': self.n_rows,
+            'n_features': len(self.dtypes),
+            'dtypes': dict(self.dtypes),
+            'missing_counts': dict(self.null_counts),
+            'missing_pct': missing_pct,
+            'numeric': numeric,
+            'cardinality': {col: len(values) for col, values in self.categories.items()}
+        }
+
+
+
+class QuantileSketch:
+    """
+    Mergeable approximate-quantile sketch (KLL-style compactor hierarchy).
+    
+    Values are kept exactly until more than exact_limit have been seen;
+    after that, full compactors are sorted and every other item is promoted
+    to the next level with doubled weight. Quantiles then carry a normalized
+    rank error of roughly ``error`` while memory stays O(1/error · log n).
+    Sketches built on separate chunks or partitions can be merged.
+    
+    Parameters
+    ----------
+    error : float
+        Target normalized rank error (e.g. 0.01 for ±1% of ranks)
+    exact_limit : int
+        Number of values kept exactly before sketching starts
+    seed : int, optional
+        Seed for the compaction coin flips
+    
+    Examples
+    --------
+    >>> sketch = QuantileSketch(error=0.005)
+    >>> for chunk in load_data('readings.csv', chunksize=100_000):
+    ...     sketch.update(chunk['pH_reading'])
+    >>> q1, q3 = sketch.quantile([0.25, 0.75])
+    """
+    
+    def __init__(self, error=0.01, exact_limit=10_000, seed=None):
+        if not 0 < error < 1:
+            raise ValueError(f"error must be in (0, 1), got {error}")
+        self.error = error
+        self.exact_limit = exact_limit
+        self.k = max(8, int(np.ceil(1.7 / error)))
+        self.n = 0
+        self._exact = []
+        self._levels = None
+        self._rng = np.random.default_rng(seed)
+    
+    @property
+    def is_exact(self):
+        """True while all values are still held exactly."""
+        return self._levels is None
+    
+    def update(self, values):
+        """Add values (NaNs are ignored); returns self."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        if self.is_exact:
+            self._exact.append(values)
+            if self.n > self.exact_limit:
+                self._start_sketch()
+        else:
+            self._levels[0] = np.concatenate([self._levels[0], values])
+            self._compress()
+        return self
+    
+    def merge(self, other):
+        """Fold another sketch into this one; returns self."""
+        self.n += other.n
+        if other.is_exact:
+            if self.is_exact:
+                self._exact.extend(other._exact)
+                if self.n > self.exact_limit:
+                    self._start_sketch()
+            else:
+                self._levels[0] = np.concatenate([self._levels[0], *other._exact])
+                self._compress()
+            return self
+        
+        if self.is_exact:
+            exact, self._exact = self._exact, []
+            self._levels = [np.concatenate([np.empty(0), *exact])]
+        for h, items in enumerate(other._levels):
+            if h == len(self._levels):
+                self._levels.append(np.empty(0))
+            self._levels[h] = np.concatenate([self._levels[h], items])
+        self._compress()
+        return self
+    
+    def _start_sketch(self):
+        self._levels = [np.concatenate(self._exact)]
+        self._exact = []
+        self._compress()
+    
+    def _capacity(self, h):
+        depth = len(self._levels) - 1 - h
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+    
+    def _compress(self):
+        h = 0
+        while h < len(self._levels):
+            items = self._levels[h]
+            if len(items) > self._capacity(h):
+                items = np.sort(items)
+                # An odd leftover item stays at this level
+                keep_odd = len(items) % 2
+                promoted = items[keep_odd + self._rng.integers(2)::2]
+                self._levels[h] = items[:keep_odd]
+                if h + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                self._levels[h + 1] = np.concatenate([self._levels[h + 1], promoted])
+            h += 1
+    
+    def quantile(self, q):
+        """
+        Quantile(s) of the stream.
+        
+        Exact (linear interpolation, as pandas) while is_exact; otherwise
+        the weighted sketch estimate.
+        
+        Parameters
+        ----------
+        q : float or array-like
+            Quantile(s) in [0, 1]
+        
+        Returns
+        -------
+        float or np.ndarray
+            Estimated quantile value(s)
+        """
+        if self.n == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        if self.is_exact:
+            return np.quantile(np.concatenate(self._exact), q)
+        
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h)
+                                  for h, level in enumerate(self._levels)])
+        order = np.argsort(items)
+        items, weights = items[order], weights[order]
+        # Midpoint ranks of each item's weight, normalized to [0, 1]
+        ranks = (np.cumsum(weights) - weights / 2) / weights.sum()
+        return np.interp(q, ranks, items)
+
+
+class BreuschPaganAccumulator:
+    """
+    Sufficient statistics of the Breusch-Pagan auxiliary regression.
+    
+    The squared residuals u = e² are regressed on the heteroscedasticity
+    design Z; accumulating Z'Z, Z'u, Σu and Σu² chunk by chunk gives the
+    same LM statistic as statsmodels' het_breuschpagan without holding the
+    residuals in memory.
+    """
+    
+    def __init__(self):
+        self.n = 0
+        self.ztz = None
+        self.ztu = None
+        self.sum_u = 0.0
+        self.sum_u2 = 0.0
+    
+    def update(self, residuals, exog_het):
+        """
+        Add a chunk of residuals with the matching rows of Z; returns self.
+        
+        A 1-D exog_het (fitted values) gets a constant column, as in
+        test_homoscedasticity.
+        """
+        resid = np.asarray(residuals, dtype=np.float64).ravel()
+        Z = np.asarray(exog_het, dtype=np.float64)
+        if Z.ndim == 1:
+            Z = np.column_stack([np.ones_like(Z), Z])
+        if len(resid) != len(Z):
+            raise ValueError(f"Got {len(resid)} residuals for {len(Z)} exog_het rows")
+        
+        u = resid * resid
+        return self._combine(len(u), Z.T @ Z, Z.T @ u, u.sum(), u @ u)
+    
+    def merge(self, other):
+        """Fold another accumulator into this one; returns self."""
+        if other.n == 0:
+            return self
+        return self._combine(other.n, other.ztz, other.ztu, other.sum_u, other.sum_u2)
+    
+    def _combine(self, n, ztz, ztu, sum_u, sum_u2):
+        if self.ztz is None:
+            self.ztz, self.ztu = ztz.copy(), ztu.copy()
+        elif self.ztz.shape != ztz.shape:
+            raise ValueError(f"exog_het has {ztz.shape[0]} columns, expected {self.ztz.shape[0]}")
+        else:
+            self.ztz += ztz
+            self.ztu += ztu
+        self.n += n
+        self.sum_u += sum_u
+        self.sum_u2 += sum_u2
+        return self
+    
+    def result(self, robust=True):
+        """
+        Lagrange multiplier statistic and chi-square p-value.
+        
+        robust=True is Koenker's studentized n·R² version (the statsmodels
+        default); robust=False is the original ESS/2 form.
+        """
+        if self.n == 0:
+            raise ValueError("No residuals accumulated")
+        k = self.ztz.shape[0]
+        coef = np.linalg.lstsq(self.ztz, self.ztu, rcond=None)[0]
+        tss = self.sum_u2 - self.sum_u ** 2 / self.n
+        ess = coef @ self.ztu - self.sum_u ** 2 / self.n
+        
+        if robust:
+            lm = self.n * ess / tss
+        else:
+            sigma2 = self.sum_u / self.n
+            lm = ess / sigma2 ** 2 / 2
+        
+        return lm, stats.chi2.sf(lm, k - 1)
+
+
+class DurbinWatsonAccumulator:
+    """
+    Running Durbin-Watson numerator and denominator over ordered chunks.
+    
+    The first and last residual of the accumulated span are kept so that the
+    lag-1 difference across each chunk boundary is included. Chunks must be
+    fed (and accumulators merged) in observation order.
+    """
+    
+    def __init__(self):
+        self.n = 0
+        self.sum_diff2 = 0.0
+        self.sum_e2 = 0.0
+        self.first = None
+        self.last = None
+    
+    def update(self, residuals):
+        """Add the next chunk of residuals in order; returns self."""
+        resid = np.asarray(residuals, dtype=np.float64).ravel()
+        if len(resid) == 0:
+            return self
+        diff = np.diff(resid)
+        return self._combine(len(resid), diff @ diff, resid @ resid, resid[0], resid[-1])
+    
+    def merge(self, other):
+        """Append the span of a later accumulator to this one; returns self."""
+        if other.n == 0:
+            return self
+        return self._combine(other.n, other.sum_diff2, other.sum_e2, other.first, other.last)
+    
+    def _combine(self, n, sum_diff2, sum_e2, first, last):
+        if self.n == 0:
+            self.first = first
+        else:
+            self.sum_diff2 += (first - self.last) ** 2
+        self.sum_diff2 += sum_diff2
+        self.sum_e2 += sum_e2
+        self.last = last
+        self.n += n
+        return self
+    
+    def result(self):
+        """Durbin-Watson statistic Σ(e_t - e_t-1)² / Σe_t²."""
+        return self.sum_diff2 / self.sum_e2 if self.sum_e2 > 0 else np.nan
+
+
+def _merge_moment_tables(old, new):
+    """Vectorized Chan merge of two tables of per-group (n, mean, m2)."""
+    old, new = old.align(new, join='outer', fill_value=0)
+    n = old['n'] + new['n']
+    delta = new['mean'] - old['mean']
+    weight = (new['n'] / n).fillna(0.0)
+    
+    return pd.DataFrame({
+        'n': n.astype(np.int64),
+        'mean': old['mean'] + delta * weight,
+        'm2': old['m2'] + new['m2'] + delta ** 2 * old['n'] * weight
+    })
+
+
+class SiteAggregates:
+    """
+    Running pH aggregates per site and per Barangay×Crop cell.
+    
+    Each table stores the count, mean and sum of squared deviations (M2)
+    per group, so appending a batch costs time proportional to the batch
+    and the number of groups, not to the full reading history. A site is
+    the Site_Id with its trailing reading index removed.
+    
+    Parameters
+    ----------
+    value_column : str
+        Column to aggregate (default 'pH_reading')
+    """
+    
+    GROUP_KEYS = ['Barangay', 'Crop']
+    
+    def __init__(self, value_column='pH_reading'):
+        self.value_column = value_column
+        empty = pd.DataFrame({'n': pd.Series(dtype=np.int64),
+                              'mean': pd.Series(dtype=np.float64),
+                              'm2': pd.Series(dtype=np.float64)})
+        self.sites = empty.rename_axis('site')
+        self.groups = empty.set_index(pd.MultiIndex.from_arrays([[], []], names=self.GROUP_KEYS))
+    
+    def append(self, readings):
+        """
+        Fold a batch of new readings into both aggregate tables.
+        
+        Parameters
+        ----------
+        readings : pd.DataFrame
+            New readings with the value column, Barangay/Crop and,
+            optionally, Site_Id
+        
+        Returns
+        -------
+        SiteAggregates
+            self, to allow chaining
+        """
+        readings = readings[readings[self.value_column].notna()]
+        values = readings[self.value_column].astype(np.float64)
+        
+        if 'Site_Id' in readings.columns:
+            site = readings['Site_Id'].astype(str).str.replace(r'_\d+$', '', regex=True).rename('site')
+            self.sites = _merge_moment_tables(self.sites, self._batch_moments(values, [site]))
+        
+        if all(key in readings.columns for key in self.GROUP_KEYS):
+            keys = [readings[key].astype(str) for key in self.GROUP_KEYS]
+            self.groups = _merge_moment_tables(self.groups, self._batch_moments(values, keys))
+        
+        return self
+    
+    @staticmethod
+    def _batch_moments(values, keys):
+        """Per-group count, mean and M2 of one batch."""
+        grouped = values.groupby(keys, observed=True)
+        batch = grouped.agg(['count', 'mean', 'var'])
+        
+        return pd.DataFrame({
+            'n': batch['count'].astype(np.int64),
+            'mean': batch['mean'],
+            'm2': batch['var'].fillna(0.0) * (batch['count'] - 1)
+        })
+    
+    def site_table(self):
+        """Per-site readings count, mean_ph and sd_ph(sample)."""
+        return self._summarize(self.sites)
+    
+    def group_table(self):
+        """Per-Barangay×Crop readings count, mean_ph and sd_ph(sample)."""
+        return self._summarize(self.groups)
+    
+    @staticmethod
+    def _summarize(table):
+        n = table['n']
+        return pd.DataFrame({
+            'n_readings': n,
+            'mean_ph': table['mean'],
+            'sd_ph(sample)': np.sqrt(table['m2'] / (n - 1)).where(n > 1)
+        })
+    
+    def save(self, directory):
+        """
+        Persist both aggregate tables as CSV files in a directory.
+        
+        Parameters
+        ----------
+        directory : str
+            Output directory (created if needed)
+        """
+        from pathlib import Path
+        
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.sites.to_csv(directory / 'site_aggregates.csv')
+        self.groups.to_csv(directory / 'barangay_crop_aggregates.csv')
+    
+    @classmethod
+    def load(cls, directory, value_column='pH_reading'):
+        """
+        Restore aggregates saved with save(); missing files start empty.
+        
+        Parameters
+        ----------
+        directory : str
+            Directory written by save()
+        value_column : str
+            Column the aggregates were built from
+        
+        Returns
+        -------
+        SiteAggregates
+            Restored aggregates
+        """
+        from pathlib import Path
+        
+        directory = Path(directory)
+        aggregates = cls(value_column=value_column)
+        dtypes = {'n': np.int64, 'mean': np.float64, 'm2': np.float64}
+        
+        site_file = directory / 'site_aggregates.csv'
+        if site_file.exists():
+            aggregates.sites = pd.read_csv(site_file, index_col='site',
+                                           dtype={'site': str, **dtypes})
+        
+        group_file = directory / 'barangay_crop_aggregates.csv'
+        if group_file.exists():
+            aggregates.groups = pd.read_csv(group_file, index_col=cls.GROUP_KEYS,
+                                            dtype={key: str for key in cls.GROUP_KEYS} | dtypes)
+        
+        return aggregates
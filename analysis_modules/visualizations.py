@@ -7,10 +7,11 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy import stats
 
+from .assumptions import get_qq_plot_data
 
-def plot_residual_diagnostics(model, figsize=(14, 10)):
+
+def plot_residual_diagnostics(model, figsize=(14, 10), qq_points=2000):
     """
     Create comprehensive residual diagnostic plots.
     
@@ -20,6 +21,8 @@ def plot_residual_diagnostics(model, figsize=(14, 10)):
         Fitted statsmodels regression
     figsize : tuple
         Figure size
+    qq_points : int
+        Maximum points drawn in the Q-Q panel (tails are kept exactly)
     
     Returns
     -------
@@ -41,7 +44,13 @@ def plot_residual_diagnostics(model, figsize=(14, 10)):
     axes[0, 0].grid(True, alpha=0.3)
     
     # 2. Q-Q Plot
-    stats.probplot(residuals, dist="norm", plot=axes[0, 1])
+    # Same plotting positions and least-squares line as stats.probplot
+    theoretical, ordered, (slope, intercept, _) = get_qq_plot_data(
+        residuals, n_points=qq_points, positions='filliben', fit=True)
+    axes[0, 1].plot(theoretical, ordered, 'bo', markersize=4)
+    axes[0, 1].plot(theoretical, slope * theoretical + intercept, 'r-', lw=2)
+    axes[0, 1].set_xlabel('Theoretical quantiles')
+    axes[0, 1].set_ylabel('Ordered Values')
     axes[0, 1].set_title('(2) Q-Q Plot\n(Check normality of residuals)')
     axes[0, 1].grid(True, alpha=0.3)
     